@@ -0,0 +1,414 @@
+# bench_datatype.py: timing benchmarks for datatype.py
+# -*- coding: utf-8 -*-
+""" Benchmarks for datatype.py, run against a stub arcpy module so they
+work outside of an ArcGIS install:
+
+    python bench_datatype.py [benchmark ...]
+
+With no arguments every benchmark is run.
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+import types
+
+try:
+    timer = time.perf_counter
+except AttributeError:
+    timer = time.time
+
+INSTALL_INFO = {'Version': '10.1', 'SPNumber': '1'}
+
+
+def install_stub_arcpy(install_info=INSTALL_INFO):
+    """ Register a fake arcpy module that counts GetInstallInfo calls."""
+    arcpy = types.ModuleType('arcpy')
+    arcpy.calls = 0
+
+    def GetInstallInfo():
+        arcpy.calls += 1
+        return dict(install_info)
+
+    arcpy.GetInstallInfo = GetInstallInfo
+    sys.modules['arcpy'] = arcpy
+    return arcpy
+
+
+def install_arcpy_package(directory, install_info=INSTALL_INFO,
+                          import_seconds=0.05):
+    """ Write a fake arcpy package to directory and put it on sys.path, for
+    code that locates arcpy on disk. Importing it takes import_seconds."""
+    package = os.path.join(directory, 'arcpy')
+    os.mkdir(package)
+    with open(os.path.join(package, '__init__.py'), 'w') as init:
+        init.write('import time\n'
+                   'time.sleep(%r)\n'
+                   'def GetInstallInfo():\n'
+                   '    return %r\n' % (import_seconds, install_info))
+    sys.modules.pop('arcpy', None)
+    sys.path.insert(0, directory)
+
+
+def fresh_import():
+    """ Import datatype.py from scratch, as a new process would."""
+    sys.modules.pop('datatype', None)
+    import datatype
+    return datatype
+
+
+def report(name, seconds, runs, unit='us'):
+    scale = {'ns': 1e9, 'us': 1e6, 'ms': 1e3}[unit]
+    print('%-40s %10.2f %s/run (%d runs)' % (
+        name, seconds / runs * scale, unit, runs))
+
+
+def bench_startup(runs=200):
+    """ Module import time and the cost of the first normalize() call."""
+    arcpy = install_stub_arcpy()
+    fresh_import()
+
+    start = timer()
+    for _ in range(runs):
+        fresh_import()
+    report('import datatype', timer() - start, runs)
+
+    arcpy.calls = 0
+    elapsed = 0.0
+    for _ in range(runs):
+        datatype = fresh_import()
+        start = timer()
+        datatype.dt.normalize('Feature Class')
+        elapsed += timer() - start
+    report('cold dt.normalize()', elapsed, runs)
+    print('%-40s %10.2f calls/process' % (
+        'arcpy.GetInstallInfo', float(arcpy.calls) / runs))
+
+
+def legacy_keyword_to_label(datatype, keyword):
+    """ keyword_to_label as it was before TypeIndex: a scan of the table."""
+    label = None
+    for (k, label_info) in datatype.get_types().items():
+        if label_info['keyword'] == keyword:
+            label = k
+    return label
+
+
+def bench_lookups(runs=20000):
+    """ Per-call cost of the label/keyword lookups, against linear scans."""
+    install_stub_arcpy()
+    datatype = fresh_import().get_datatype()
+    keywords = datatype.get_keywords()
+    labels = datatype.get_labels()
+    keyword, label = keywords[-1], labels[-1]
+
+    start = timer()
+    for _ in range(runs // 100):
+        legacy_keyword_to_label(datatype, keyword)
+    report('keyword_to_label (scan)', timer() - start, runs // 100, 'ns')
+
+    start = timer()
+    for _ in range(runs):
+        datatype.keyword_to_label(keyword)
+    report('keyword_to_label (index)', timer() - start, runs, 'ns')
+
+    start = timer()
+    for _ in range(runs):
+        keyword in keywords
+    report('keyword membership (list)', timer() - start, runs, 'ns')
+
+    start = timer()
+    for _ in range(runs):
+        keyword in datatype.index.keyword_set
+    report('keyword membership (frozenset)', timer() - start, runs, 'ns')
+
+    start = timer()
+    for _ in range(runs):
+        datatype.normalize(label)
+    report('normalize(label)', timer() - start, runs, 'ns')
+
+
+def bench_batch(runs=200, params=500):
+    """ Normalizing a toolbox's worth of datatypes, one call each vs batched."""
+    install_stub_arcpy()
+    datatype = fresh_import().get_datatype()
+    names = datatype.get_labels() + datatype.get_keywords()
+    raw_types = [names[i % len(names)] for i in range(params)]
+
+    start = timer()
+    for _ in range(runs):
+        [datatype.normalize(raw_type) for raw_type in raw_types]
+    report('normalize() x %d' % params, timer() - start, runs)
+
+    start = timer()
+    for _ in range(runs):
+        datatype.normalize_many(raw_types)
+    report('normalize_many(%d)' % params, timer() - start, runs)
+
+
+def bench_cache(runs=20):
+    """ First normalize() in a new process, importing arcpy vs loading the
+    on-disk cache."""
+    directory = tempfile.mkdtemp()
+    try:
+        install_arcpy_package(directory)
+        cache = os.path.join(directory, 'datatype.cache')
+        os.environ['DATATYPE_CACHE'] = cache
+
+        elapsed = 0.0
+        for _ in range(runs):
+            if os.path.exists(cache):
+                os.remove(cache)
+            sys.modules.pop('arcpy', None)
+            datatype = fresh_import()
+            start = timer()
+            datatype.dt.normalize('Feature Class')
+            elapsed += timer() - start
+        report('cold normalize() (import arcpy)', elapsed, runs, 'ms')
+
+        elapsed = 0.0
+        for _ in range(runs):
+            sys.modules.pop('arcpy', None)
+            datatype = fresh_import()
+            start = timer()
+            datatype.dt.normalize('Feature Class')
+            elapsed += timer() - start
+            assert 'arcpy' not in sys.modules
+        report('cold normalize() (cache)', elapsed, runs, 'ms')
+    finally:
+        os.environ.pop('DATATYPE_CACHE', None)
+        sys.path.remove(directory)
+        sys.modules.pop('arcpy', None)
+        shutil.rmtree(directory)
+
+
+def legacy_attributes(datatype):
+    """ The per-instance attributes DataType held before they became views
+    over its TypeIndex: the types dictionary and three lists."""
+    types = datatype.get_types()
+    return (types, list(types.keys()),
+            [v['keyword'] for v in types.values()],
+            [v['description'] for v in types.values()])
+
+
+def traced_bytes(func):
+    """ Bytes still allocated after calling func, and its result."""
+    import tracemalloc
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        result = func()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return size, result
+
+
+def bench_memory(instances=50):
+    """ Memory held per DataType instance, measured with tracemalloc."""
+    try:
+        import tracemalloc
+    except ImportError:
+        print('memory: tracemalloc needs Python 3.4+')
+        return
+    install_stub_arcpy()
+    datatype = fresh_import()
+    size, first = traced_bytes(
+        lambda: datatype.DataType(INSTALL_INFO))
+    print('%-40s %10d bytes' % ('first DataType (with index)', size))
+    size, _ = traced_bytes(
+        lambda: [datatype.DataType(INSTALL_INFO) for _ in range(instances)])
+    print('%-40s %10d bytes' % ('each further DataType', size // instances))
+    size, _ = traced_bytes(lambda: first.descriptions[0])
+    print('%-40s %10d bytes' % ('descriptions, once read', size))
+    size, _ = traced_bytes(
+        lambda: [legacy_attributes(first) for _ in range(instances)])
+    print('%-40s %10d bytes' % ('each legacy types/labels/... copy',
+                                size // instances))
+
+
+def bench_resolver(runs=20000):
+    """ Resolving case/whitespace variants, completions and suggestions."""
+    install_stub_arcpy()
+    datatype = fresh_import().get_datatype()
+    variants = [' %s ' % label.lower() for label in datatype.get_labels()]
+    resolver = datatype.index.resolver()
+
+    start = timer()
+    for i in range(runs):
+        resolver.resolve(variants[i % len(variants)])
+    elapsed = timer() - start
+    report('resolve(variant)', elapsed, runs, 'ns')
+    print('%-40s %10.0f lookups/ms' % ('', runs / (elapsed * 1e3)))
+
+    start = timer()
+    for i in range(runs):
+        datatype.normalize(variants[i % len(variants)])
+    report('normalize(variant)', timer() - start, runs, 'ns')
+
+    start = timer()
+    for _ in range(runs):
+        resolver.resolve('No Such Type')
+    report('resolve(miss)', timer() - start, runs, 'ns')
+
+    start = timer()
+    for _ in range(runs // 100):
+        resolver.complete('raster')
+    report('complete(prefix)', timer() - start, runs // 100)
+
+    misses = ['%s%d' % (label[:-2], i)
+              for (i, label) in enumerate(datatype.get_labels())]
+    start = timer()
+    for miss in misses:
+        resolver.suggest(miss)
+    report('suggest(miss)', timer() - start, len(misses))
+
+    start = timer()
+    for miss in misses:
+        resolver.suggest(miss)
+    report('suggest(miss, memoized)', timer() - start, len(misses))
+
+
+TOOLBOX = """import arcpy
+
+class Tool%(n)d(object):
+    def getParameterInfo(self):
+        params = []
+        for i in range(10):
+            params.append(arcpy.Parameter(
+                name='p%%d' %% i, displayName='P', direction='Input',
+                datatype=%(datatype)r, parameterType='Required'))
+        params.append(arcpy.Parameter('out', 'Out', 'Output',
+                                      ['Long', 'GPDouble'], 'Optional'))
+        return params
+"""
+
+
+def bench_validate(files=2000):
+    """ Scanning a directory of toolboxes with validate_datatypes."""
+    install_stub_arcpy()
+    labels = fresh_import().get_datatype().get_labels()
+    import validate_datatypes
+    directory = tempfile.mkdtemp()
+    try:
+        for n in range(files):
+            path = os.path.join(directory, 'toolbox%d.pyt' % n)
+            with open(path, 'w') as toolbox:
+                toolbox.write(TOOLBOX % {
+                    'n': n, 'datatype': labels[n % len(labels)]})
+        for jobs in (1, None):
+            start = timer()
+            scanned = sum(1 for _ in validate_datatypes.scan_files(
+                [directory], jobs=jobs))
+            report('scan %d toolboxes (jobs=%s)' % (scanned, jobs or 'cpus'),
+                   timer() - start, 1, 'ms')
+    finally:
+        shutil.rmtree(directory)
+
+
+def bench_stats(runs=20000):
+    """ normalize() with lookup statistics off and on."""
+    install_stub_arcpy()
+    datatype = fresh_import().get_datatype()
+    labels = datatype.get_labels()
+
+    start = timer()
+    for i in range(runs):
+        datatype.normalize(labels[i % len(labels)])
+    report('normalize() (stats off)', timer() - start, runs, 'ns')
+
+    stats = datatype.enable_stats()
+    start = timer()
+    for i in range(runs):
+        datatype.normalize(labels[i % len(labels)])
+    report('normalize() (stats on)', timer() - start, runs, 'ns')
+    datatype.disable_stats()
+
+    normalize = stats.snapshot()['methods']['normalize']
+    print('%-40s %10.2f ns p50, %.2f ns p99' % (
+        'recorded normalize() latency', normalize['p50'] * 1e9,
+        normalize['p99'] * 1e9))
+
+
+def bench_registry(sizes=(100, 1000, 5000), repeat=5, runs=20000):
+    """ Layering overlays over the base table as the registry grows: the
+    cost of a merge against a full rebuild, and lookups in the result."""
+    install_stub_arcpy()
+    datatype = fresh_import()
+    base = datatype.DataType(INSTALL_INFO)
+    index = base.index
+
+    def rebuild(records):
+        # later records replace earlier ones with the same label
+        records = dict((r.label, r) for r in records).values()
+        rebuilt = datatype.TypeIndex(records)
+        rebuilt.translation(base.convention)
+        return rebuilt
+
+    for size in sizes:
+        overlay = [datatype.TypeRecord('Type %05d' % n, 'GPType%05d' % n)
+                   for n in range(size)]
+        start = timer()
+        for _ in range(repeat):
+            grown = index.merge(overlay)
+        report('merge %d types' % size, timer() - start, repeat)
+
+        start = timer()
+        for _ in range(repeat):
+            rebuild(index.records + tuple(overlay))
+        report('rebuild %d + %d types' % (len(index.records), size),
+               timer() - start, repeat)
+
+        # a small overlay over the grown registry
+        small = [datatype.TypeRecord('Type %05d' % n, 'GPNewType%d' % n)
+                 for n in range(10)]
+        start = timer()
+        for _ in range(repeat):
+            grown.merge(small)
+        report('merge 10 into %d types' % len(grown.records),
+               timer() - start, repeat)
+
+        start = timer()
+        for _ in range(repeat):
+            rebuild(grown.records + tuple(small))
+        report('rebuild %d + 10 types' % len(grown.records),
+               timer() - start, repeat)
+
+        table = grown.translation(base.convention)
+        labels = [r.label for r in grown.records]
+        start = timer()
+        for i in range(runs):
+            table.get(labels[i % len(labels)])
+        report('lookup in %d types' % len(labels), timer() - start, runs,
+               'ns')
+
+
+BENCHMARKS = [
+    ('startup', bench_startup),
+    ('lookups', bench_lookups),
+    ('batch', bench_batch),
+    ('cache', bench_cache),
+    ('memory', bench_memory),
+    ('resolver', bench_resolver),
+    ('validate', bench_validate),
+    ('stats', bench_stats),
+    ('registry', bench_registry),
+]
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    selected = dict(BENCHMARKS)
+    for name in argv:
+        if name not in selected:
+            sys.exit('unknown benchmark: %s (choose from %s)' % (
+                name, ', '.join(n for n, _ in BENCHMARKS)))
+    for name, bench in BENCHMARKS:
+        if not argv or name in argv:
+            bench()
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,916 @@
 # datatype.py: get datatype from ArcGIS
 # -*- coding: utf-8 -*-
-import arcpy
+import bisect
+import csv
+import io
+import json
+import marshal
+import math
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+
+try:
+    from collections.abc import Mapping, Sequence
+except ImportError:
+    # Python 2
+    from collections import Mapping, Sequence
+try:
+    from types import MappingProxyType
+except ImportError:
+    # Python 2: no read-only dict view, use the dictionary itself
+    MappingProxyType = dict
+try:
+    from sys import intern
+except ImportError:
+    # Python 2: intern is a builtin
+    pass
+try:
+    string_types = basestring
+except NameError:
+    # Python 3
+    string_types = str
+
+# Datatype naming conventions: the old (localized) names, or the
+# locale-independent keywords.
+LABEL = 'label'
+KEYWORD = 'keyword'
+
+# Naming convention by release, as (first release, convention) in
+# ascending order. Releases are (major, minor, patch, service pack)
+# tuples, see parse_release.
+RELEASE_POLICIES = (
+    # Versions prior to 10.1SP1 need labels not keywords. 10.0 doesn't
+    # have Python toolboxes, so this isn't really needed before 10.1
+    ((10, 0, 0, 0), LABEL),
+    # keywords are the default type in 10.1SP1+
+    ((10, 1, 0, 1), KEYWORD),
+)
+
+# Bump when the layout of the cache file changes (see save_cache).
+CACHE_FORMAT = 1
+# Environment variable overriding the cache file path; set it to an empty
+# string to disable the cache. By default the cache is kept in a per-user
+# directory (see cache_path).
+CACHE_ENV = 'DATATYPE_CACHE'
+# Environment variable which, when set to a non-empty value, turns on lookup
+# statistics for every new DataType (see DataType.enable_stats).
+STATS_ENV = 'DATATYPE_STATS'
+
+# ArcGIS installation info, fetched once per process (see get_install_info).
+_install_info = None
+# The cache file contents loaded by get_install_info, if any.
+_cache = None
+
+
+def get_install_info(index=None):
+    """ Get the ArcGIS installation info dictionary. arcpy is imported and
+    queried only on the first call; later calls reuse the result.
+
+    Given the TypeIndex in use, a process that hasn't imported arcpy yet
+    first tries the on-disk cache (see load_cache), and one that has to
+    import arcpy writes it for the next process."""
+    global _install_info, _cache
+    if _install_info is None:
+        cache = load_cache(index) if index is not None else None
+        if cache is not None and 'arcpy' not in sys.modules:
+            _cache = cache
+            _install_info = cache['install_info']
+            return _install_info
+        import arcpy
+        _install_info = arcpy.GetInstallInfo()
+        if index is not None and (
+                cache is None or cache['install_info'] != _install_info):
+            save_cache(index, _install_info)
+    return _install_info
+
+
+def parse_release(version, sp='N/A'):
+    """ Parse a version and service pack, as reported by GetInstallInfo
+    (e.g. '10.1' and '1', or '10.2.2' and 'N/A'), into a comparable
+    (major, minor, patch, service pack) tuple. Returns None if the
+    version has no numbers in it."""
+    numbers = [int(n) for n in re.findall(r'\d+', str(version))][:3]
+    if not numbers:
+        return None
+    numbers.extend([0] * (3 - len(numbers)))
+    sp_numbers = re.findall(r'\d+', str(sp))
+    numbers.append(int(sp_numbers[0]) if sp_numbers else 0)
+    return tuple(numbers)
+
+
+def release_convention(version, sp='N/A', product=None):
+    """ The datatype naming convention (LABEL or KEYWORD) for a release,
+    or None if it can't be determined and datatypes should be passed
+    through unchanged."""
+    release = parse_release(version, sp)
+    if release is None:
+        return None
+    # ArcGIS Pro restarted its version numbers at 1.0, and has always
+    # used keywords; there is no arcpy before 10.0 to confuse it with.
+    if product == 'ArcGISPro' or release[0] < 10:
+        return KEYWORD
+    convention = None
+    for (first_release, policy) in RELEASE_POLICIES:
+        if release >= first_release:
+            convention = policy
+    return convention
+
+
+def _label_order(label):
+    """ Sort key matching the (case-insensitive) order of the documentation."""
+    return (label.lower(), label)
+
+
+# Descriptions of the built-in types, loaded on first read.
+_descriptions = None
+
+
+def _type_descriptions():
+    """ label -> description for the built-in types."""
+    global _descriptions
+    if _descriptions is None:
+        try:
+            from datatype_descriptions import DESCRIPTIONS
+        except ImportError:
+            from .datatype_descriptions import DESCRIPTIONS
+        _descriptions = DESCRIPTIONS
+    return _descriptions
+
+
+def _intern(value):
+    """ value as an interned native str, or as it is if it can't be one
+    (non-ASCII unicode on Python 2)."""
+    if not isinstance(value, str):
+        try:
+            value = str(value)
+        except UnicodeError:
+            return value
+    return intern(value)
+
+
+class TypeRecord(object):
+    """ A single datatype: its label (old datatype string), keyword and
+    description. The label and keyword are interned; the description of a
+    built-in type is only loaded when it is read. Records also support
+    record['keyword'] style access, like the dictionaries in get_types().
+    """
+    __slots__ = ('label', 'keyword', '_description')
+
+    def __init__(self, label, keyword, description=None):
+        self.label = _intern(label)
+        self.keyword = _intern(keyword)
+        self._description = description
+
+    @property
+    def description(self):
+        if self._description is None:
+            return _type_descriptions().get(self.label, '')
+        return self._description
+
+    def __getitem__(self, field):
+        if field not in ('label', 'keyword', 'description'):
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def __eq__(self, other):
+        if not isinstance(other, TypeRecord):
+            return NotImplemented
+        return (self.label, self.keyword, self._description) == \
+            (other.label, other.keyword, other._description)
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self):
+        return hash((self.label, self.keyword))
+
+    def __repr__(self):
+        return 'TypeRecord(%r, %r)' % (self.label, self.keyword)
+
+
+# TypeRecords of the built-in types, built on first use (see _type_records).
+_records = None
+
+
+def _type_records():
+    """ TypeRecords of the built-in types, in documentation order."""
+    global _records
+    if _records is None:
+        _records = tuple(TypeRecord(label, keyword)
+                         for (label, keyword) in _TYPES)
+    return _records
+
+
+# Labels of the built-in types, built on first use (see _keyword_order).
+_builtin_labels = None
+
+
+def _keyword_order(label):
+    """ Sort key of the labels sharing a keyword: the built-in types' in
+    documentation order, then any layered over them in the same order, so
+    an added label never takes over a built-in keyword's conversion."""
+    global _builtin_labels
+    if _builtin_labels is None:
+        _builtin_labels = frozenset(label for (label, _) in _TYPES)
+    return (label not in _builtin_labels,) + _label_order(label)
+
+
+class _FieldView(Sequence):
+    """ Read-only sequence of one field of a TypeIndex's records, in
+    documentation order."""
+
+    def __init__(self, records, field, members=None):
+        self._records = records
+        self._field = field
+        self._members = members
+
+    def __len__(self):
+        return len(self._records)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [getattr(r, self._field) for r in self._records[i]]
+        return getattr(self._records[i], self._field)
+
+    def __contains__(self, value):
+        if self._members is not None:
+            try:
+                return value in self._members
+            except TypeError:
+                return False
+        return Sequence.__contains__(self, value)
+
+    def __repr__(self):
+        return '<%s view of %d types>' % (self._field, len(self))
+
+
+class _TypesView(Mapping):
+    """ Read-only label -> TypeRecord mapping of a TypeIndex, iterating in
+    documentation order."""
+
+    def __init__(self, index):
+        self._index = index
+
+    def __getitem__(self, label):
+        return self._index.by_label[label]
+
+    def __iter__(self):
+        return (r.label for r in self._index.records)
+
+    def __len__(self):
+        return len(self._index.records)
+
+    def __contains__(self, label):
+        try:
+            return label in self._index.by_label
+        except TypeError:
+            return False
+
+    def __repr__(self):
+        return '<types view of %d types>' % len(self)
+
+
+class UnknownDataTypeError(ValueError):
+    """ Raised when datatypes aren't in the types table; `unknown` holds all
+    of the offending values, in input order."""
+
+    def __init__(self, unknown):
+        self.unknown = tuple(unknown)
+        ValueError.__init__(self, 'unknown datatype(s): %s' % (
+            ', '.join(repr(u) for u in self.unknown)))
+
+
+def fold(raw_type):
+    """ Case-folded key for a datatype string, ignoring all whitespace, so
+    'feature class', 'FeatureClass' and 'Feature  Class ' are the same."""
+    return ''.join(raw_type.split()).lower()
+
+
+def _ngrams(key, n=3):
+    """ The set of n-grams of a folded key, padded to mark its ends."""
+    padded = '^%s$' % key
+    return set(padded[i:i + n] for i in range(max(len(padded) - n + 1, 1)))
+
+
+class _LRUCache(object):
+    """ A small least-recently-used cache of a bounded size."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        try:
+            value = self._data.pop(key)
+        except KeyError:
+            return default
+        self._data[key] = value
+        return value
+
+    def put(self, key, value):
+        self._data.pop(key, None)
+        self._data[key] = value
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class TypeResolver(object):
+    """ Resolves datatype strings that differ from a label or keyword only in
+    case or whitespace, completes prefixes and suggests close matches, all
+    from indexes precomputed over a TypeIndex.
+
+    Resolved names are the label or keyword as spelled in the table; when a
+    folded key matches both a label and a keyword, the label wins.
+    Suggestions name each type once, and are memoized in an LRU cache of
+    `cache_size` entries.
+    """
+
+    def __init__(self, index, cache_size=1024):
+        self.index = index
+        # folded key -> label or keyword; labels are added last, to win
+        self.by_key = {}
+        # folded key -> label of the type it names; a keyword names the type
+        # of the label it converts to
+        self.by_type = {}
+        for (keyword, labels) in index.by_keyword.items():
+            self.by_key[fold(keyword)] = keyword
+            self.by_type[fold(keyword)] = labels[0]
+        for record in index.records:
+            self.by_key[fold(record.label)] = record.label
+            self.by_type[fold(record.label)] = record.label
+        self.keys = tuple(sorted(self.by_key))
+        # n-gram -> indexes into self.keys containing it
+        grams = {}
+        for (i, key) in enumerate(self.keys):
+            for gram in _ngrams(key):
+                grams.setdefault(gram, []).append(i)
+        self.grams = dict((g, tuple(ids)) for (g, ids) in grams.items())
+        self._trie = None
+        self._suggestions = _LRUCache(cache_size)
+
+    def resolve(self, raw_type):
+        """ The label or keyword raw_type refers to, or None."""
+        if not isinstance(raw_type, string_types):
+            return None
+        return self.by_key.get(fold(raw_type))
+
+    def suggest(self, raw_type, limit=5, cutoff=0.4):
+        """ Up to `limit` labels or keywords most similar to raw_type, best
+        first, by the Dice coefficient of their n-grams; candidates scoring
+        below `cutoff` are left out. Where both the label and the keyword of
+        a type match, only the better scoring of the two is given."""
+        if not isinstance(raw_type, string_types):
+            return []
+        key = (raw_type, limit, cutoff)
+        suggestions = self._suggestions.get(key)
+        if suggestions is None:
+            suggestions = tuple(self._suggest(raw_type, limit, cutoff))
+            self._suggestions.put(key, suggestions)
+        return list(suggestions)
+
+    def _suggest(self, raw_type, limit, cutoff):
+        query = _ngrams(fold(raw_type))
+        shared = {}
+        for gram in query:
+            for i in self.grams.get(gram, ()):
+                shared[i] = shared.get(i, 0) + 1
+        scored = []
+        for (i, count) in shared.items():
+            key = self.keys[i]
+            # the padded key of length k has k + 2 - n + 1 = k n-grams
+            score = 2.0 * count / (len(query) + max(len(key), 1))
+            if score >= cutoff:
+                scored.append((-score, key))
+        scored.sort()
+        suggestions = []
+        seen = set()
+        for (_, key) in scored:
+            if self.by_type[key] not in seen:
+                seen.add(self.by_type[key])
+                suggestions.append(self.by_key[key])
+                if len(suggestions) == limit:
+                    break
+        return suggestions
+
+    def complete(self, prefix, limit=10):
+        """ Labels and keywords whose folded form starts with the folded
+        prefix, in folded order, up to `limit` of them."""
+        if not isinstance(prefix, string_types):
+            return []
+        node = self._get_trie()
+        for char in fold(prefix):
+            node = node.get(char)
+            if node is None:
+                return []
+        (first, last) = node['']
+        return [self.by_key[key]
+                for key in self.keys[first:min(last, first + limit)]]
+
+    def _get_trie(self):
+        """ The prefix trie of folded keys, built on first use: nested dicts
+        keyed by character. As self.keys is sorted, the keys under a node
+        are a slice of it, whose (first, last) bounds are stored under ''.
+        """
+        if self._trie is None:
+            trie = {'': [0, len(self.keys)]}
+            for (i, key) in enumerate(self.keys):
+                node = trie
+                for char in key:
+                    node = node.setdefault(char, {'': [i, i]})
+                    node[''][1] = i + 1
+            self._trie = trie
+        return self._trie
+
+
+class TypeIndex(object):
+    """ Immutable lookup tables over a sequence of TypeRecords (see
+    DataType.get_records), built once so every lookup is a single hash probe.
+
+    Some keywords are shared by more than one label ('GPGALayer' is both
+    'Geostatistical Layer' and 'Geostatistical Value Table'); those labels
+    are kept in documentation order, built-in types' first (see
+    _keyword_order), and the first one is the label a keyword converts to.
+    """
+    __slots__ = ('records', 'by_label', 'by_keyword', 'label_set',
+                 'keyword_set', 'types', 'labels', 'keywords', 'descriptions',
+                 '_translations', '_digest', '_resolver', '_merged',
+                 '_keys')
+
+    def __init__(self, records):
+        # records in documentation order
+        self.records = tuple(
+            sorted(records, key=lambda r: _label_order(r.label)))
+        self.by_label = dict((r.label, r) for r in self.records)
+        by_keyword = {}
+        for record in self.records:
+            by_keyword.setdefault(record.keyword, []).append(record.label)
+        self.by_keyword = dict(
+            (k, tuple(sorted(v, key=_keyword_order) if len(v) > 1 else v))
+            for (k, v) in by_keyword.items())
+        self.label_set = frozenset(self.by_label)
+        self.keyword_set = frozenset(self.by_keyword)
+        self._finish({})
+
+    def _finish(self, translations):
+        """ Set up the views and lazily built state of a new index."""
+        # read-only views, see the DataType attributes of the same names
+        self.types = _TypesView(self)
+        self.labels = _FieldView(self.records, 'label', self.label_set)
+        self.keywords = _FieldView(self.records, 'keyword', self.keyword_set)
+        self.descriptions = _FieldView(self.records, 'description')
+        self._translations = translations
+        self._digest = None
+        self._resolver = None
+        self._merged = {}
+        self._keys = None
+
+    def _order_keys(self):
+        """ _label_order of each record, computed on first use by merge."""
+        if self._keys is None:
+            self._keys = [_label_order(r.label) for r in self.records]
+        return self._keys
+
+    def merge(self, records):
+        """ A new TypeIndex with records layered over this one's, replacing
+        those with the same label; the later of records sharing a label
+        wins. Labels added for a built-in keyword come after the built-in
+        ones, so don't change what it converts to.
+
+        The result matches a TypeIndex built from the combined records, but
+        shares this one's TypeRecords, and unless the records outnumber this
+        index's, only the entries for the labels and keywords they touch are
+        rebuilt, including those of translation tables already compiled
+        here."""
+        new = OrderedDict((r.label, r) for r in records)
+        if len(new) > len(self.records):
+            # most entries would change, so build the index from scratch
+            records = [new.get(r.label, r) for r in self.records]
+            records.extend(r for r in new.values()
+                           if r.label not in self.by_label)
+            index = TypeIndex(records)
+            for convention in self._translations:
+                index.translation(convention)
+            return index
+        keys = list(self._order_keys())
+        merged = list(self.records)
+        added = []
+        for record in new.values():
+            key = _label_order(record.label)
+            if record.label in self.by_label:
+                merged[bisect.bisect_left(keys, key)] = record
+            else:
+                added.append((key, record))
+        if len(added) <= 32:
+            for (key, record) in added:
+                i = bisect.bisect_left(keys, key)
+                keys.insert(i, key)
+                merged.insert(i, record)
+        else:
+            # a merge of two sorted runs, which sort does in linear time;
+            # keys are unique, so records are never compared
+            added.sort()
+            pairs = sorted(list(zip(keys, merged)) + added)
+            keys = [key for (key, _) in pairs]
+            merged = [record for (_, record) in pairs]
+
+        by_label = self.by_label.copy()
+        by_label.update(new)
+        by_keyword = self.by_keyword.copy()
+        affected = set(new)
+        for record in new.values():
+            old = self.by_label.get(record.label)
+            if old is not None and old.keyword != record.keyword:
+                labels = tuple(l for l in by_keyword[old.keyword]
+                               if l != record.label)
+                if labels:
+                    by_keyword[old.keyword] = labels
+                else:
+                    del by_keyword[old.keyword]
+                affected.add(old.keyword)
+            if old is None or old.keyword != record.keyword:
+                labels = by_keyword.get(record.keyword)
+                if labels:
+                    by_keyword[record.keyword] = tuple(sorted(
+                        labels + (record.label,), key=_keyword_order))
+                else:
+                    by_keyword[record.keyword] = (record.label,)
+            affected.add(record.keyword)
+
+        index = TypeIndex.__new__(TypeIndex)
+        index.records = tuple(merged)
+        index.by_label = by_label
+        index.by_keyword = by_keyword
+        index.label_set = self.label_set.union(new)
+        index.keyword_set = frozenset(by_keyword)
+        translations = {}
+        for (convention, table) in self._translations.items():
+            patched = dict(table)
+            for name in affected:
+                normalized = index._translate(name, convention)
+                if normalized is None:
+                    patched.pop(name, None)
+                else:
+                    patched[name] = normalized
+            translations[convention] = MappingProxyType(patched)
+        index._finish(translations)
+        index._keys = keys
+        return index
+
+    def with_overlay(self, overlay):
+        """ This index merged with a TypeOverlay's records, reusing the
+        index from an earlier merge of the same overlay."""
+        index = self._merged.get(overlay)
+        if index is None:
+            index = self._merged[overlay] = self.merge(overlay.records)
+        return index
+
+    def resolver(self):
+        """ The TypeResolver over this index, built on first use."""
+        if self._resolver is None:
+            self._resolver = TypeResolver(self)
+        return self._resolver
+
+    def digest(self):
+        """ A hex digest of the table's labels and keywords, identifying it
+        in caches."""
+        if self._digest is None:
+            import hashlib
+            pairs = [(r.label, r.keyword) for r in self.records]
+            self._digest = hashlib.sha1(
+                repr(pairs).encode('utf-8')).hexdigest()
+        return self._digest
+
+    def translation(self, convention):
+        """ A read-only mapping of every label and keyword to its form under
+        a naming convention (LABEL, KEYWORD, or None to keep the input as
+        is), compiled on first use. Strings that are both a label and a
+        keyword are treated as labels."""
+        table = self._translations.get(convention)
+        if table is None:
+            compiled = {}
+            for (keyword, labels) in self.by_keyword.items():
+                compiled[keyword] = labels[0] if convention == LABEL \
+                    else keyword
+            for record in self.records:
+                compiled[record.label] = record.keyword \
+                    if convention == KEYWORD else record.label
+            table = MappingProxyType(compiled)
+            self._translations[convention] = table
+        return table
+
+    def _translate(self, name, convention):
+        """ A single entry of translation(convention), or None."""
+        record = self.by_label.get(name)
+        if record is not None:
+            return record.keyword if convention == KEYWORD else record.label
+        labels = self.by_keyword.get(name)
+        if labels:
+            return labels[0] if convention == LABEL else name
+        return None
+
+
+def _decode(value):
+    """ Text of a UTF-8 encoded value read by Python 2's csv."""
+    return value.decode('utf-8') if isinstance(value, bytes) else value
+
+
+class TypeOverlay(object):
+    """ Types to layer over the base 10.1 table (see TypeIndex.merge), such
+    as those added by a later release. An overlay only applies to installs
+    of at least `version`, and of `product` (a GetInstallInfo ProductName,
+    e.g. 'ArcGISPro') if given. A version without numbers in it raises a
+    ValueError.
+    """
+
+    def __init__(self, records, version=None, product=None, name=None):
+        if version is not None and parse_release(version) is None:
+            raise ValueError('overlay %s: version %r has no release number'
+                             % (name or '', version))
+        self.records = tuple(records)
+        self.version = version
+        self.product = product
+        self.name = name
+
+    @classmethod
+    def load(cls, path, version=None, product=None):
+        """ Load an overlay from a JSON or CSV file.
+
+        JSON files hold a list of {"label", "keyword", "description"}
+        objects, or an object with that list under "types" and optional
+        "version" and "product" keys. CSV files have a header row naming
+        label, keyword and (optionally) description columns. version and
+        product override those in the file."""
+        if path.lower().endswith('.csv'):
+            # utf-8-sig skips the byte order mark Excel starts files with
+            if sys.version_info[0] < 3:
+                # Python 2's csv only reads bytes
+                with open(path, 'rb') as handle:
+                    text = handle.read().decode('utf-8-sig')
+                rows = [dict((key, _decode(value))
+                             for (key, value) in row.items())
+                        for row in csv.DictReader(
+                            text.encode('utf-8').splitlines(True))]
+            else:
+                with io.open(path, newline='',
+                             encoding='utf-8-sig') as handle:
+                    rows = list(csv.DictReader(handle))
+            data = {'types': rows}
+        else:
+            with io.open(path, encoding='utf-8') as handle:
+                data = json.load(handle)
+            if isinstance(data, list):
+                data = {'types': data}
+        records = [TypeRecord(row['label'], row['keyword'],
+                              row.get('description') or None)
+                   for row in data['types']]
+        return cls(records, version or data.get('version'),
+                   product or data.get('product'), path)
+
+    def applies_to(self, install_info):
+        """ Whether the overlay applies to a GetInstallInfo-style dict."""
+        if self.product is not None and \
+                install_info.get('ProductName') != self.product:
+            return False
+        if self.version is None:
+            return True
+        release = parse_release(install_info.get('Version'),
+                                install_info.get('SPNumber'))
+        return release is not None and \
+            release >= parse_release(self.version)
+
+    def __repr__(self):
+        return '<TypeOverlay %s: %d types>' % (
+            self.name or '', len(self.records))
+
+
+# Overlays loaded from files, by (path, size, mtime, version, product).
+_overlays = {}
+
+
+def load_overlay(path, version=None, product=None):
+    """ Load a TypeOverlay from a file (see TypeOverlay.load), reusing the
+    one already loaded from it if the file hasn't changed, so instances
+    given the same files share their merged indexes."""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    key = (path, stat.st_size, stat.st_mtime, version, product)
+    overlay = _overlays.get(key)
+    if overlay is None:
+        overlay = _overlays[key] = TypeOverlay.load(path, version, product)
+    return overlay
+
+
+def cache_path(index):
+    """ Path of the cache file for a TypeIndex, or None if disabled. It
+    defaults to a per-user directory: %LOCALAPPDATA%\\datatype on Windows,
+    and $XDG_CACHE_HOME/datatype or ~/.cache/datatype elsewhere."""
+    path = os.environ.get(CACHE_ENV)
+    if path is not None:
+        return path or None
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or \
+            os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'datatype',
+                        'datatype-%s.cache' % index.digest()[:16])
+
+
+def _is_trusted(cache_file):
+    """ Whether an open cache file belongs to this user, and nobody else
+    can write to it; marshal data can't be trusted otherwise. Always true
+    where there are no POSIX owners, as on Windows."""
+    if not hasattr(os, 'getuid'):
+        return True
+    stat = os.fstat(cache_file.fileno())
+    return stat.st_uid == os.getuid() and not stat.st_mode & 0o022
+
+
+def _arcpy_fingerprint():
+    """ Location, size and modification time of the arcpy package, found
+    without importing it; None if arcpy can't be found. Installing a new
+    release or service pack changes it, invalidating the cache."""
+    try:
+        from importlib.util import find_spec
+    except ImportError:
+        import imp
+        try:
+            path = imp.find_module('arcpy')[1]
+        except ImportError:
+            return None
+    else:
+        try:
+            spec = find_spec('arcpy')
+        except (ImportError, ValueError):
+            return None
+        if spec is None or not spec.origin:
+            return None
+        path = spec.origin
+    if os.path.isdir(path):
+        path = os.path.join(path, '__init__.py')
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (os.path.abspath(path), stat.st_size, int(stat.st_mtime))
+
+
+def _cache_key(index):
+    """ Everything a cache file must match to be reused."""
+    fingerprint = _arcpy_fingerprint()
+    if fingerprint is None:
+        return None
+    return (CACHE_FORMAT, tuple(sys.version_info[:2]), index.digest(),
+            fingerprint)
+
+
+def load_cache(index, path=None):
+    """ Load the cached install info and translation table for a TypeIndex
+    without importing arcpy. Returns None when there is no cache, it was
+    written for another table, Python or ArcGIS install, or it isn't
+    trusted (see _is_trusted)."""
+    path = path or cache_path(index)
+    if path is None:
+        return None
+    key = _cache_key(index)
+    if key is None:
+        return None
+    try:
+        with open(path, 'rb') as cache_file:
+            if not _is_trusted(cache_file):
+                return None
+            cache = marshal.load(cache_file)
+    except (IOError, OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(cache, dict) or cache.get('key') != key:
+        return None
+    return cache
+
+
+def save_cache(index, install_info, path=None):
+    """ Write the install info, with the naming convention and translation
+    table it resolves to, for later processes to load. The file is
+    replaced atomically, and failing to write it is not an error.
+    Returns True if the cache was written."""
+    path = path or cache_path(index)
+    if path is None:
+        return False
+    key = _cache_key(index)
+    if key is None:
+        return False
+    convention = release_convention(install_info.get('Version'),
+                                    install_info.get('SPNumber'),
+                                    install_info.get('ProductName'))
+    cache = {
+        'key': key,
+        'install_info': dict(install_info),
+        'convention': convention,
+        'translation': dict(index.translation(convention)),
+    }
+    import tempfile
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        if not os.path.isdir(directory):
+            os.makedirs(directory, 0o700)
+        (handle, temp_path) = tempfile.mkstemp(
+            prefix='.datatype-', dir=directory)
+        try:
+            with os.fdopen(handle, 'wb') as cache_file:
+                marshal.dump(cache, cache_file)
+            _replace(temp_path, path)
+        except Exception:
+            os.remove(temp_path)
+            raise
+    except (IOError, OSError, ValueError):
+        return False
+    return True
+
+
+def _replace(source, destination):
+    """ os.replace, which Python 2 lacks; its os.rename won't overwrite an
+    existing file on Windows."""
+    try:
+        replace = os.replace
+    except AttributeError:
+        if os.name == 'nt' and os.path.exists(destination):
+            os.remove(destination)
+        replace = os.rename
+    replace(source, destination)
+
+
+class LookupStats(object):
+    """ Call counts, latencies and outcomes of DataType lookups, recorded by
+    DataType.enable_stats. Outcomes are 'hit' (an exact match), 'miss' (not
+    an exact match, but resolved as a case or whitespace variant) and
+    'unknown' (not resolved); unknown datatypes are tallied by value.
+    Latency percentiles are taken over the latest `samples` calls of each
+    method.
+    """
+
+    def __init__(self, samples=1000):
+        self.samples = samples
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """ Forget everything recorded so far."""
+        with self._lock:
+            self._methods = {}
+            self._unknown = {}
+
+    def record(self, method, seconds, outcome, raw_type=None):
+        """ Record one call of a method, taking `seconds`."""
+        with self._lock:
+            stats = self._methods.get(method)
+            if stats is None:
+                stats = self._methods[method] = {
+                    'calls': 0, 'seconds': 0.0,
+                    'latencies': deque(maxlen=self.samples),
+                    'outcomes': {'hit': 0, 'miss': 0, 'unknown': 0}}
+            stats['calls'] += 1
+            stats['seconds'] += seconds
+            stats['latencies'].append(seconds)
+            stats['outcomes'][outcome] += 1
+            if outcome == 'unknown':
+                try:
+                    self._unknown[raw_type] = \
+                        self._unknown.get(raw_type, 0) + 1
+                except TypeError:
+                    # unhashable input
+                    self._unknown[repr(raw_type)] = \
+                        self._unknown.get(repr(raw_type), 0) + 1
+
+    def snapshot(self):
+        """ A dictionary of everything recorded so far: per method, the call
+        count, total and mean seconds, p50/p90/p99/max latency and outcome
+        tallies, plus the count of each unknown datatype under 'unknown'."""
+        with self._lock:
+            methods = {}
+            for (method, stats) in self._methods.items():
+                latencies = sorted(stats['latencies'])
+                summary = {
+                    'calls': stats['calls'],
+                    'seconds': stats['seconds'],
+                    'mean': stats['seconds'] / stats['calls'],
+                    'max': latencies[-1],
+                }
+                for percent in (50, 90, 99):
+                    # nearest-rank percentile
+                    rank = max(
+                        int(math.ceil(len(latencies) * percent / 100.0)), 1)
+                    summary['p%d' % percent] = latencies[rank - 1]
+                summary.update(stats['outcomes'])
+                methods[method] = summary
+            return {'methods': methods, 'unknown': dict(self._unknown)}
+
 
 class DataType(object):
     """ Determine whether we should use keyword parameter types or names. 
@@ -10,222 +920,451 @@ class DataType(object):
     """ 
     version = None
     sp = None
-    types = None
-    labels = None
-    keywords = None
-    descriptions = None
+    # TypeIndex over get_records(), shared by every instance of a class
+    _index = None
+    # TypeIndex in use: the class's, or one merged with overlays
+    index = None
+    # LookupStats being recorded, see enable_stats
+    stats = None
+    # methods enable_stats instruments
+    _instrumented = ('normalize', 'keyword_to_label', 'label_to_keyword')
 
-    def __init__(self):
+    def __init__(self, install_info=None, overlays=()):
+        """ install_info defaults to the running ArcGIS install; pass a
+        GetInstallInfo-style dictionary to work as another release.
+        overlays are TypeOverlays, or paths to load them from, to layer
+        over the base table where they apply (see load_overlay)."""
+        self.install_info = install_info
+        self.index = self.get_index()
         self.version = self.get_version()
         self.service_pack = self.get_sp()
-        self.types = self.get_types()
-        self.labels = self.get_labels()
-        self.keywords = self.get_keywords()
-        self.descriptions = self.get_descriptions()
+        self.release = parse_release(self.version, self.service_pack)
+        self.convention = self.naming_convention()
+        self._translation = self._cached_translation() or \
+            self.index.translation(self.convention)
+        for overlay in overlays:
+            self.load_overlay(overlay)
+        if os.environ.get(STATS_ENV):
+            self.enable_stats()
+
+    def load_overlay(self, overlay):
+        """ Layer a TypeOverlay, or the path of a file to load one from,
+        over this instance's types. Returns whether it applies to this
+        release, and so was layered."""
+        if not isinstance(overlay, TypeOverlay):
+            overlay = load_overlay(overlay)
+        if not overlay.applies_to(self._get_install_info()):
+            return False
+        self.index = self.index.with_overlay(overlay)
+        self._translation = self.index.translation(self.convention)
+        if 'normalize' in self.__dict__:
+            # rewrap the instrumented methods around the new table
+            self.enable_stats(self.stats)
+        return True
+
+    def enable_stats(self, stats=None):
+        """ Start recording lookup statistics into a LookupStats (a new one
+        by default), which is returned and kept as self.stats.
+
+        The instrumented methods are wrapped on this instance only, so
+        instances without statistics run the plain methods at no cost.
+        normalize_many and normalize_parameters record each datatype as a
+        normalize call."""
+        self.disable_stats()
+        self.stats = stats if stats is not None else LookupStats()
+        for name in self._instrumented:
+            setattr(self, name, self._instrument(name))
+        return self.stats
+
+    def disable_stats(self):
+        """ Stop recording lookup statistics; self.stats keeps what was
+        recorded."""
+        for name in self._instrumented:
+            self.__dict__.pop(name, None)
+
+    def _instrument(self, name):
+        """ Wrap a bound method to time its calls and classify the result."""
+        method = getattr(type(self), name).__get__(self)
+        stats = self.stats
+        translation = self._translation
+        try:
+            timer = time.perf_counter
+        except AttributeError:
+            # Python 2
+            timer = time.clock if os.name == 'nt' else time.time
+
+        def instrumented(*args, **kwargs):
+            # the datatype looked up, passed by position or by name
+            raw_type = args[0] if args else next(iter(kwargs.values()), None)
+            start = timer()
+            try:
+                result = method(*args, **kwargs)
+            except Exception:
+                stats.record(name, timer() - start, 'unknown', raw_type)
+                raise
+            elapsed = timer() - start
+            if result is None:
+                outcome = 'unknown'
+            elif name == 'normalize' and raw_type not in translation:
+                outcome = 'miss'
+            else:
+                outcome = 'hit'
+            stats.record(name, elapsed, outcome, raw_type)
+            return result
+
+        instrumented.__name__ = name
+        instrumented.__doc__ = method.__doc__
+        return instrumented
+
+    @property
+    def types(self):
+        """ read-only mapping of label to TypeRecord."""
+        return self.index.types
+
+    @property
+    def labels(self):
+        """ read-only sequence of all labels (old datatype strings)."""
+        return self.index.labels
+
+    @property
+    def keywords(self):
+        """ read-only sequence of all keywords, one per label."""
+        return self.index.keywords
+
+    @property
+    def descriptions(self):
+        """ read-only sequence of all descriptions, one per label."""
+        return self.index.descriptions
 
     def get_version(self):
         """ Get installation major release verson (e.g. 10.0, 10.1)."""
-        return arcpy.GetInstallInfo()['Version']
+        return self._get_install_info()['Version']
 
     def get_sp(self):
         """ Get installation service pack number (e.g. 1, N/A)."""
-        return arcpy.GetInstallInfo()['SPNumber']
+        return self._get_install_info()['SPNumber']
+
+    def _get_install_info(self):
+        if self.install_info is not None:
+            return self.install_info
+        return get_install_info(self.index)
+
+    def _cached_translation(self):
+        """ The translation table from the on-disk cache, if it was loaded
+        for this table and naming convention."""
+        if self.install_info is not None or _cache is None or \
+                _cache['key'][2] != self.index.digest() or \
+                _cache['convention'] != self.convention:
+            return None
+        return MappingProxyType(_cache['translation'])
+
+    def naming_convention(self):
+        """ Which datatype strings this release expects: LABEL for the
+        old names, KEYWORD for locale-independent keywords, or None
+        where input should be passed through unchanged."""
+        product = self._get_install_info().get('ProductName')
+        return release_convention(self.version, self.service_pack, product)
 
     def normalize(self, raw_type):
         """ Determine the appropriate naming convention based on release, 
-        normalize the input datatype as needed."""
-        normalized = None
-        type_of = None
-        # determine what we're getting
-        if raw_type in self.labels:
-            type_of = 'label'
-        elif raw_type in self.keywords:
-            type_of = 'keyword'
-
-        # only continue if we have a recognized type
-        if type_of is not None:
-            # Versions prior to 10.1SP1 need labels not keywords. 10.0
-            # doesn't have Python toolboxes, so this isn't really needed
-            # for versions prior to 10.1
-            if (self.version == '10.0') or \
-                    (self.version == 10.1 and self.service_pack == 'N/A'):
-                if type_of == 'keyword':
-                    normalized = self.keyword_to_label(raw_type)
-
-            if self.version == '10.1' and self.service_pack == '1':
-                # keywords are the default type in 10.1SP1+
-                if type_of == 'label':
-                    normalized = self.label_to_keyword(raw_type)
-            
-            if normalized is None:
-                # haven't needed to modify the output; return the input
-                normalized = raw_type
+        normalize the input datatype as needed. Datatypes that differ from
+        a known one only in case or whitespace are resolved to it."""
+        normalized = self._translation.get(raw_type)
+        if normalized is None:
+            resolved = self.resolve(raw_type)
+            if resolved is not None:
+                normalized = self._translation[resolved]
+        return normalized
+
+    def resolve(self, raw_type):
+        """ The label or keyword a datatype refers to, ignoring case and
+        whitespace, or None."""
+        return self.index.resolver().resolve(raw_type)
+
+    def suggest(self, raw_type, limit=5):
+        """ Known datatypes most similar to raw_type, best first."""
+        return self.index.resolver().suggest(raw_type, limit)
 
+    def complete(self, prefix, limit=10):
+        """ Known datatypes starting with prefix, ignoring case and
+        whitespace."""
+        return self.index.resolver().complete(prefix, limit)
+
+    def translation_table(self):
+        """ A read-only mapping of every known label and keyword to its
+        normalized form for this release."""
+        return self._translation
+
+    def normalize_many(self, raw_types, strict=True):
+        """ Normalize a sequence of datatypes in one pass, returning a list
+        in input order. Unknown datatypes are reported together in a single
+        UnknownDataTypeError, or left as None if strict is False."""
+        raw_types = list(raw_types)
+        if 'normalize' in self.__dict__:
+            # statistics are on, so look up each through the instrumented
+            # normalize to record it
+            normalized = [self.normalize(raw_type) for raw_type in raw_types]
+        else:
+            table = self.translation_table()
+            normalized = [table.get(raw_type) for raw_type in raw_types]
+            if None in normalized:
+                # fall back on resolving case and whitespace variants
+                normalized = [self.normalize(raw_type) if result is None
+                              else result for (raw_type, result)
+                              in zip(raw_types, normalized)]
+        if strict and None in normalized:
+            unknown = [raw_type for (raw_type, result)
+                       in zip(raw_types, normalized) if result is None]
+            raise UnknownDataTypeError(unknown)
         return normalized
 
+    def normalize_parameters(self, parameters, strict=True):
+        """ Normalize the datatype of every arcpy.Parameter in a list, such
+        as the one built in a Python toolbox's getParameterInfo(). The
+        parameters are updated in place and returned. With strict False,
+        unknown datatypes are left as they were."""
+        parameters = list(parameters)
+        raw_types = []
+        for param in parameters:
+            datatype = param.datatype
+            # composite parameters take a list of datatypes
+            if isinstance(datatype, (list, tuple)):
+                raw_types.extend(datatype)
+            else:
+                raw_types.append(datatype)
+        normalized = iter(
+            raw_type if result is None else result for (raw_type, result)
+            in zip(raw_types, self.normalize_many(raw_types, strict)))
+        for param in parameters:
+            datatype = param.datatype
+            if isinstance(datatype, (list, tuple)):
+                param.datatype = [next(normalized) for _ in datatype]
+            else:
+                param.datatype = next(normalized)
+        return parameters
+
     def keyword_to_label(self, keyword=None):
-        """ convert a keyword to a label (old datatype strings)."""
-        label = None 
-        for (k, label_info) in self.get_types().items():
-            if label_info['keyword'] == keyword:
-                label = k
-        return label
+        """ convert a keyword to a label (old datatype strings). Keywords
+        shared by several labels give the first in documentation order."""
+        labels = self.index.by_keyword.get(keyword)
+        if labels:
+            return labels[0]
+        return None
+
+    def keyword_to_labels(self, keyword=None):
+        """ all labels sharing a keyword, in documentation order."""
+        return self.index.by_keyword.get(keyword, ())
 
     def label_to_keyword(self, label=None):
         """ convert an old datatype string to a keyword."""
         # convert label to keyword
-        return self.types[label]['keyword']
+        return self.index.by_label[label].keyword
                
     def get_labels(self):
         """ get all labels (old datatype strings)."""
-        return self.get_types().keys()
+        return [r.label for r in self._records_in_use()]
 
     def get_keywords(self):
         """ get all keywords (locale-independent types)."""
-        return [v['keyword'] for v in self.get_types().values()]
+        return [r.keyword for r in self._records_in_use()]
 
     def get_descriptions(self):
         """ get all descriptions of our types."""
-        return [v['description'] for v in self.get_types().values()]
+        return [r.description for r in self._records_in_use()]
+
+    def _records_in_use(self):
+        """ records of the index in use, including any overlays."""
+        return (self.index or self.get_index()).records
+
+    def get_index(self):
+        """ get the TypeIndex over get_records(), building it on first use."""
+        cls = type(self)
+        index = cls.__dict__.get('_index')
+        if index is None:
+            index = TypeIndex(self.get_records())
+            cls._index = index
+        return index
  
     def get_types(self):
-        """ A dictionary of all types, pulled from the 10.1 documentation.
+        """ A dictionary of all types, pulled from the 10.1 documentation,
+        plus those of any overlays loaded (see load_overlay).
 http://resources.arcgis.com/en/help/main/10.1/index.html#//001500000035000000
         """
-        types = { 
-  'Address Locator': {'keyword': 'DEAddressLocator',  'description': 'A dataset, used for geocoding, that stores the address attributes, associated indexes, and rules that define the process for translating nonspatial descriptions of places to spatial data.'},
-  'Address Locator Style': {'keyword': 'GPAddressLocatorStyle',  'description': 'A template on which to base the new address locator.'},
-  'Analysis Cell Size': {'keyword': 'analysis_cell_size',  'description': 'The cell size used by raster tools.'},
-  'Any Value': {'keyword': 'GPType',  'description': 'A data type that accepts any value.'},
-  'ArcMap Document': {'keyword': 'DEMapDocument',  'description': 'A file that contains one map, its layout, and its associated layers, tables, charts, and reports.'},
-  'Areal Unit': {'keyword': 'GPArealUnit',  'description': 'An areal unit type and value such as square meter or acre.'},
-  'Boolean': {'keyword': 'GPBoolean',  'description': 'A Boolean value.'},
-  'CAD Drawing Dataset': {'keyword': 'DECadDrawingDataset',  'description': 'A vector data source with a mix of feature types with symbology. The dataset is not usable for feature class-based queries or analysis.'},
-  'Calculator Expression': {'keyword': 'GPCalculatorExpression',  'description': 'A calculator expression.'},
-  'Catalog Root': {'keyword': 'DECatalogRoot',  'description': 'The top-level node in the Catalog tree.'},
-  'Cell Size': {'keyword': 'GPSACellSize',  'description': 'The cell size used byArcGIS Spatial Analyst extension.'},
-  'Cell Size XY': {'keyword': 'GPCellSizeXY',  'description': 'Defines the two sides of a raster cell.'},
-  'Composite Layer': {'keyword': 'GPCompositeLayer',  'description': 'A reference to several children layers, including symbology and rendering properties.'},
-  'Compression': {'keyword': 'GPSAGDBEnvCompression',  'description': 'Specifies the type of compression used for a raster.'},
-  'Coordinate System': {'keyword': 'GPCoordinateSystem',  'description': 'A reference framework&mdash;such as the UTM system&mdash;consisting of a set of points, lines, and/or surfaces, and a set of rules, used to define the positions of points in two- and three-dimensional space.'},
-  'Coordinate Systems Folder': {'keyword': 'DESpatialReferencesFolder',  'description': 'A folder on disk storing coordinate systems.'},
-  'Coverage': {'keyword': 'DECoverage',  'description': 'A coverage dataset, a proprietary data model for storing geographic features as points, arcs, and polygons with associated feature attribute tables.'},
-  'Coverage Feature Class': {'keyword': 'DECoverageFeatureClasses',  'description': 'A coverage feature class, such as point, arc, node, route, route system, section, polygon, and region.'},
-  'Data Element': {'keyword': 'DEType',  'description': 'A dataset visible in ArcCatalog.'},
-  'Data File': {'keyword': 'GPDataFile',  'description': 'A data file.'},
-  'Database Connections': {'keyword': 'DERemoteDatabaseFolder',  'description': 'The database connection folder in ArcCatalog.'},
-  'Dataset': {'keyword': 'DEDatasetType',  'description': 'A collection of related data, usually grouped or stored together.'},
-  'Date': {'keyword': 'GPDate',  'description': 'A date value.'},
-  'dBase Table': {'keyword': 'DEDbaseTable',  'description': 'Attribute data stored in dBASE format.'},
-  'Decimate': {'keyword': 'GP3DADecimate',  'description': 'Specifies a subset of nodes of a TIN to create a generalized version of that TIN.'},
-  'Disk Connection': {'keyword': 'DEDiskConnection',  'description': 'An access path to a data storage device.'},
-  'Double': {'keyword': 'GPDouble',  'description': 'Any floating-point number will be stored as a double-precision, 64-bit value.'},
-  'Encrypted String': {'keyword': 'GPEncryptedString',  'description': 'Encrypted string for passwords.'},
-  'Envelope': {'keyword': 'GPEnvelope',  'description': 'The coordinate pairs that define the minimum bounding rectangle the data source falls within.'},
-  'Evaluation Scale': {'keyword': 'GPEvaluationScale',  'description': 'The scale value range and increment value applied to inputs in a weighted overlay operation.'},
-  'Extent': {'keyword': 'GPExtent',  'description': 'Specifies the coordinate pairs that define the minimum bounding rectangle (xmin, ymin and xmax, ymax) of a data source. All coordinates for the data source fall within this boundary.'},
-  'Extract Values': {'keyword': 'GPSAExtractValues',  'description': 'An extract values parameter.'},
-  'Feature Class': {'keyword': 'DEFeatureClass',  'description': 'A collection of spatial data with the same shape type: point, multipoint, polyline, and polygon.'},
-  'Feature Dataset': {'keyword': 'DEFeatureDataset',  'description': 'A collection of feature classes that share a common geographic area and the same spatial reference system.'},
-  'Feature Layer': {'keyword': 'GPFeatureLayer',  'description': 'A reference to a feature class, including symbology and rendering properties.'},
-  'Feature Set': {'keyword': 'GPFeatureRecordSetLayer',  'description': 'Interactive features; draw the features when the tool is run.'},
-  'Field': {'keyword': 'Field',  'description': 'A column in a table that stores the values for a single attribute.'},
-  'Field Info': {'keyword': 'GPFieldInfo',  'description': 'The details about a field in a FieldMap.'},
-  'Field Mappings': {'keyword': 'GPFieldMapping',  'description': 'A collection of fields in one or more input tables.'},
-  'File': {'keyword': 'DEFile',  'description': 'A file on disk.'},
-  'Folder': {'keyword': 'DEFolder',  'description': 'Specifies a location on a disk where data is stored.'},
-  'Formulated Raster': {'keyword': 'GPRasterFormulated',  'description': 'A raster surface whose cell values are represented by a formula or constant.'},
-  'Fuzzy function': {'keyword': 'GPSAFuzzyFunction',  'description': 'Fuzzy function.'},
-  'Geodataset': {'keyword': 'DEGeodatasetType',  'description': 'A collection of data with a common theme in a geodatabase.'},
-  'GeoDataServer': {'keyword': 'DEGeoDataServer',  'description': 'A coarse-grained object that references a geodatabase.'},
-  'Geometric Network': {'keyword': 'DEGeometricNetwork',  'description': 'A linear network represented by topologically connected edge and junction features. Feature connectivity is based on their geometric coincidence.'},
-  'Geostatistical Layer': {'keyword': 'GPGALayer',  'description': 'A reference to a geostatistical data source, including symbology and rendering properties.'},
-  'Geostatistical Search Neighborhood': {'keyword': 'GPGASearchNeighborhood',  'description': 'Defines the searching neighborhood parameters for a geostatistical layer.'},
-  'Geostatistical Value Table': {'keyword': 'GPGALayer',  'description': 'A collection of data sources and fields that define a geostatistical layer.'},
-  'GlobeServer': {'keyword': 'DEGlobeServer',  'description': 'A Globe server.'},
-  'GPServer': {'keyword': 'DEGPServer',  'description': 'A geoprocessing server.'},
-  'Graph': {'keyword': 'GPGraph',  'description': 'A graph.'},
-  'Graph Data Table': {'keyword': 'GPGraphDataTable',  'description': 'A graph data table.'},
-  'Group Layer': {'keyword': 'GPGroupLayer',  'description': 'A collection of layers that appear and act as a single layer. Group layers make it easier to organize a map, assign advanced drawing order options, and share layers for use in other maps.'},
-  'Horizontal Factor': {'keyword': 'GPSAHorizontalFactor',  'description': 'The relationship between the horizontal cost factor and the horizontal relative moving angle.'},
-  'Image Service': {'keyword': 'DEImageServer',  'description': 'An image service.'},
-  'Index': {'keyword': 'Index',  'description': 'A data structure used to speed the search for records in geographic datasets and databases.'},
-  'INFO Expression': {'keyword': 'GPINFOExpression',  'description': 'A syntax for defining and manipulating data in an INFO table.'},
-  'INFO Item': {'keyword': 'GPArcInfoItem',  'description': 'An item in an INFO table.'},
-  'INFO Table': {'keyword': 'DEArcInfoTable',  'description': 'A table in an INFO database.'},
-  'LAS Dataset': {'keyword': 'DELasDataset',  'description': 'A LAS dataset stores reference to one or more LAS files on disk, as well as to additional surface features. A LAS file is a binary file that is designed to store airborne lidar data.'},
-  'LAS Dataset Layer': {'keyword': 'GPLasDatasetLayer',  'description': 'A layer that references a LAS dataset on disk. This layer can apply filters on lidar files and surface constraints referenced by a LAS dataset.'},
-  'Layer': {'keyword': 'GPLayer',  'description': 'A reference to a data source, such as a shapefile, coverage, geodatabase feature class, or raster, including symbology and rendering properties.'},
-  'Layer File': {'keyword': 'DELayer',  'description': 'A file with a .lyr extension that stores the layer definition, including symbology and rendering properties.'},
-  'Line': {'keyword': 'GPLine',  'description': 'A shape, straight or curved, defined by a connected series of unique x,y coordinate pairs.'},
-  'Linear Unit': {'keyword': 'GPLinearUnit',  'description': 'A linear unit type and value such as meter or feet.'},
-  'Long': {'keyword': 'GPLong',  'description': 'An integer number value.'},
-  'M Domain': {'keyword': 'GPMDomain',  'description': 'A range of lowest and highest possible value for m coordinates.'},
-  'MapServer': {'keyword': 'DEMapServer',  'description': 'A map server.'},
-  'Mosaic Dataset': {'keyword': 'DEMosaicDataset',  'description': 'A collection of raster and image data that allows you to store, view, and query the data. It is a data model within the geodatabase used to manage a collection of raster datasets (images) stored as a catalog and viewed as a mosaicked image.'},
-  'Mosaic Layer': {'keyword': 'GPMosaicLayer',  'description': 'A layer that references a mosaic dataset.'},
-  'Neighborhood': {'keyword': 'GPSANeighborhood',  'description': 'The shape of the area around each cell used to calculate statistics.'},
-  'Network Analyst Class FieldMap': {'keyword': 'NAClassFieldMap',  'description': 'Mapping between location properties in a Network Analyst layer (such as stops, facilities and incidents) and a point feature class.'},
-  'Network Analyst Hierarchy Settings': {'keyword': 'GPNAHierarchySettings',  'description': 'A hierarchy attribute that divides hierarchy values of a network dataset into three groups using two integers. The first integer, high_rank_ends, sets the ending value of the first group; the second number, low_rank_begin, sets the beginning value of the third group.'},
-  'Network Analyst Layer': {'keyword': 'GPNALayer',  'description': 'A special group layer used to express and solve network routing problems. Each sublayer held in memory in a Network Analyst layer represents some aspect of the routing problem and the routing solution.'},
-  'Network Dataset': {'keyword': 'DENetworkDataset',  'description': 'A collection of topologically connected network elements (edges, junctions, and turns), derived from network sources and associated with a collection of network attributes.'},
-  'Network Dataset Layer': {'keyword': 'GPNetworkDatasetLayer',  'description': 'A reference to a network dataset, including symbology and rendering properties.'},
-  'Parcel Fabric': {'keyword': 'DECadastralFabric',  'description': 'A parcel fabric is a dataset for the storage, maintenance, and editing of a continuous surface of connected parcels or parcel network.'},
-  'Parcel Fabric Layer': {'keyword': 'GPCadastralFabricLayer',  'description': 'A layer referencing a parcel fabric on disk. This layer works as a group layer organizing a set of related layers under a single layer.'},
-  'Point': {'keyword': 'GPPoint',  'description': 'A pair of x,y coordinates.'},
-  'Polygon': {'keyword': 'GPPolygon',  'description': 'A connected sequence of x,y coordinate pairs, where the first and last coordinate pair are the same.'},
-  'Projection File': {'keyword': 'DEPrjFile',  'description': 'A file storing coordinate system information for spatial data.'},
-  'Pyramid': {'keyword': 'GPSAGDBEnvPyramid',  'description': 'Specifies if pyramids will be built.'},
-  'Radius': {'keyword': 'GPSARadius',  'description': 'Specifies which surrounding points will be used for interpolation.'},
-  'Random Number Generator': {'keyword': 'GPRandomNumberGenerator',  'description': 'Specifies the seed and the generator to be used when creating random values.'},
-  'Raster Band': {'keyword': 'DERasterBand',  'description': 'A layer in a raster dataset.'},
-  'Raster Calculator Expression': {'keyword': 'GPRasterCalculatorExpression',  'description': 'A raster calculator expression.'},
-  'Raster Catalog': {'keyword': 'DERasterCatalog',  'description': 'A collection of raster datasets defined in a table; each table record defines an individual raster dataset in the catalog.'},
-  'Raster Catalog Layer': {'keyword': 'GPRasterCatalogLayer',  'description': 'A reference to a raster catalog, including symbology and rendering properties.'},
-  'Raster Data Layer': {'keyword': 'GPRasterDataLayer',  'description': 'A raster data layer.'},
-  'Raster Dataset': {'keyword': 'DERasterDataset',  'description': 'A single dataset built from one or more rasters.'},
-  'Raster Layer': {'keyword': 'GPRasterLayer',  'description': 'A reference to a raster, including symbology and rendering properties.'},
-  'Raster Statistics': {'keyword': 'GPSAGDBEnvStatistics',  'description': 'Specifies if raster statistics will be built.'},
-  'Raster Type': {'keyword': 'GPRasterBuilder',  'description': 'Raster data is added to a mosaic dataset by specifying a raster type. The raster type identifies metadata, such as georeferencing, acquisition date, and sensor type, along with a raster format.'},
-  'Record Set': {'keyword': 'GPRecordSet',  'description': 'Interactive table; type in the table values when the tool is run.'},
-  'Relationship Class': {'keyword': 'DERelationshipClass',  'description': 'The details about the relationship between objects in the geodatabase.'},
-  'Remap': {'keyword': 'GPSARemap',  'description': 'A table that defines how raster cell values will be reclassified.'},
-  'Route Measure Event Properties': {'keyword': 'GPRouteMeasureEventProperties',  'description': 'Specifies the fields on a table that describe events that are measured by a linear reference route system.'},
-  'Schematic Dataset': {'keyword': 'DESchematicDataset',  'description': 'A schematic dataset contains a collection of schematic diagram templates and schematic feature classes that share the same application domain, for example, water or electrical. It can reside in a personal, file, or ArcSDE geodatabase.'},
-  'Schematic Diagram': {'keyword': 'DESchematicDiagram',  'description': 'A schematic diagram.'},
-  'Schematic Folder': {'keyword': 'DESchematicFolder',  'description': 'A schematic folder.'},
-  'Schematic Layer': {'keyword': 'GPSchematicLayer',  'description': 'A schematic layer is a composite layer composed of feature layers based on the schematic feature classes associated with the template on which the schematic diagram is based.'},
-  'Semivariogram': {'keyword': 'GPSASemiVariogram',  'description': 'Specifies the distance and direction representing two locations that are used to quantify autocorrelation.'},
-  'ServerConnection': {'keyword': 'DEServerConnection',  'description': 'A server connection.'},
-  'Shapefile': {'keyword': 'DEShapefile',  'description': 'Spatial data in shapefile format.'},
-  'Spatial Reference': {'keyword': 'GPSpatialReference',  'description': 'The coordinate system used to store a spatial dataset, including the spatial domain.'},
-  'SQL Expression': {'keyword': 'GPSQLExpression',  'description': 'A syntax for defining and manipulating data from a relational database.'},
-  'String': {'keyword': 'GPString',  'description': 'A text value.'},
-  'Table': {'keyword': 'DETable',  'description': 'Tabular data.'},
-  'Table View': {'keyword': 'GPTableView',  'description': 'A representation of tabular data for viewing and editing purposes, stored in memory or on disk.'},
-  'Terrain Layer': {'keyword': 'GPTerrainLayer',  'description': 'A reference to a terrain, including symbology and rendering properties. It\'s used to draw a terrain.'},
-  'Text File': {'keyword': 'DETextfile',  'description': 'Data stored in ASCII format.'},
-  'Tile Size': {'keyword': 'GPSAGDBEnvTileSize',  'description': 'Specifies the width and the height of a data stored in block.'},
-  'Time configuration': {'keyword': 'GPSATimeConfiguration',  'description': 'Specifies the time periods used for calculating solar radiation at specific locations.'},
-  'TIN': {'keyword': 'DETin',  'description': 'A vector data structure that partitions geographic space into contiguous, nonoverlapping triangles. The vertices of each triangle are sample data points with x-, y-, and z-values.'},
-  'Tin Layer': {'keyword': 'GPTinLayer',  'description': 'A reference to a TIN, including topological relationships, symbology, and rendering properties.'},
-  'Tool': {'keyword': 'DETool',  'description': 'A geoprocessing tool.'},
-  'Toolbox': {'keyword': 'DEToolbox',  'description': 'A geoprocessing toolbox.'},
-  'Topo Features': {'keyword': 'GPSATopoFeatures',  'description': 'Features that are input to the interpolation.'},
-  'Topology': {'keyword': 'DETopology',  'description': 'A topology that defines and enforces data integrity rules for spatial data.'},
-  'Topology Layer': {'keyword': 'GPTopologyLayer',  'description': 'A reference to a topology, including symbology and rendering properties.'},
-  'Value Table': {'keyword': 'GPValueTable',  'description': 'A collection of columns of values.'},
-  'Variant': {'keyword': 'GPVariant',  'description': 'A data value that can contain any basic type: Boolean, date, double, long, and string.'},
-  'Vertical Factor': {'keyword': 'GPSAVerticalFactor',  'description': 'Specifies the relationship between the vertical cost factor and the vertical, relative moving angle.'},
-  'VPF Coverage': {'keyword': 'DEVPFCoverage',  'description': 'Spatial data stored in Vector Product Format.'},
-  'VPF Table': {'keyword': 'DEVPFTable',  'description': 'Attribute data stored in Vector Product Format.'},
-  'WCS Coverage': {'keyword': 'DEWCSCoverage',  'description': 'Web Coverage Service (WCS) is an open specification for sharing raster datasets on the web.'},
-  'Weighted Overlay Table': {'keyword': 'GPSAWeightedOverlayTable',  'description': 'A table with data to combine multiple rasters by applying a common measurement scale of values to each raster, weighing each according to its importance.'},
-  'Weighted Sum': {'keyword': 'GPSAWeightedSum',  'description': 'Specifies data for overlaying several rasters multiplied each by their given weight and then summed.'},
-  'WMS Map': {'keyword': 'DEWMSMap',  'description': 'A WMS Map.'},
-  'Workspace': {'keyword': 'DEWorkspace',  'description': 'A container such as a geodatabase or folder.'},
-  'XY Domain': {'keyword': 'GPXYDomain',  'description': 'A range of lowest and highest possible values for x,y coordinates.'},
-  'Z Domain': {'keyword': 'GPZDomain',  'description': 'A range of lowest and highest possible values for z coordinates.'}}
-        return types
-
-dt = DataType()
+        return dict(
+            (r.label, {'keyword': r.keyword, 'description': r.description})
+            for r in self._records_in_use())
+
+    def get_records(self):
+        """ TypeRecords of all types, in documentation order."""
+        return _type_records()
+
+
+# (label, keyword) pairs of all types, pulled from the 10.1 documentation.
+# http://resources.arcgis.com/en/help/main/10.1/index.html#//001500000035000000
+_TYPES = (
+  ('Address Locator', 'DEAddressLocator'),
+  ('Address Locator Style', 'GPAddressLocatorStyle'),
+  ('Analysis Cell Size', 'analysis_cell_size'),
+  ('Any Value', 'GPType'),
+  ('ArcMap Document', 'DEMapDocument'),
+  ('Areal Unit', 'GPArealUnit'),
+  ('Boolean', 'GPBoolean'),
+  ('CAD Drawing Dataset', 'DECadDrawingDataset'),
+  ('Calculator Expression', 'GPCalculatorExpression'),
+  ('Catalog Root', 'DECatalogRoot'),
+  ('Cell Size', 'GPSACellSize'),
+  ('Cell Size XY', 'GPCellSizeXY'),
+  ('Composite Layer', 'GPCompositeLayer'),
+  ('Compression', 'GPSAGDBEnvCompression'),
+  ('Coordinate System', 'GPCoordinateSystem'),
+  ('Coordinate Systems Folder', 'DESpatialReferencesFolder'),
+  ('Coverage', 'DECoverage'),
+  ('Coverage Feature Class', 'DECoverageFeatureClasses'),
+  ('Data Element', 'DEType'),
+  ('Data File', 'GPDataFile'),
+  ('Database Connections', 'DERemoteDatabaseFolder'),
+  ('Dataset', 'DEDatasetType'),
+  ('Date', 'GPDate'),
+  ('dBase Table', 'DEDbaseTable'),
+  ('Decimate', 'GP3DADecimate'),
+  ('Disk Connection', 'DEDiskConnection'),
+  ('Double', 'GPDouble'),
+  ('Encrypted String', 'GPEncryptedString'),
+  ('Envelope', 'GPEnvelope'),
+  ('Evaluation Scale', 'GPEvaluationScale'),
+  ('Extent', 'GPExtent'),
+  ('Extract Values', 'GPSAExtractValues'),
+  ('Feature Class', 'DEFeatureClass'),
+  ('Feature Dataset', 'DEFeatureDataset'),
+  ('Feature Layer', 'GPFeatureLayer'),
+  ('Feature Set', 'GPFeatureRecordSetLayer'),
+  ('Field', 'Field'),
+  ('Field Info', 'GPFieldInfo'),
+  ('Field Mappings', 'GPFieldMapping'),
+  ('File', 'DEFile'),
+  ('Folder', 'DEFolder'),
+  ('Formulated Raster', 'GPRasterFormulated'),
+  ('Fuzzy function', 'GPSAFuzzyFunction'),
+  ('GeoDataServer', 'DEGeoDataServer'),
+  ('Geodataset', 'DEGeodatasetType'),
+  ('Geometric Network', 'DEGeometricNetwork'),
+  ('Geostatistical Layer', 'GPGALayer'),
+  ('Geostatistical Search Neighborhood', 'GPGASearchNeighborhood'),
+  ('Geostatistical Value Table', 'GPGALayer'),
+  ('GlobeServer', 'DEGlobeServer'),
+  ('GPServer', 'DEGPServer'),
+  ('Graph', 'GPGraph'),
+  ('Graph Data Table', 'GPGraphDataTable'),
+  ('Group Layer', 'GPGroupLayer'),
+  ('Horizontal Factor', 'GPSAHorizontalFactor'),
+  ('Image Service', 'DEImageServer'),
+  ('Index', 'Index'),
+  ('INFO Expression', 'GPINFOExpression'),
+  ('INFO Item', 'GPArcInfoItem'),
+  ('INFO Table', 'DEArcInfoTable'),
+  ('LAS Dataset', 'DELasDataset'),
+  ('LAS Dataset Layer', 'GPLasDatasetLayer'),
+  ('Layer', 'GPLayer'),
+  ('Layer File', 'DELayer'),
+  ('Line', 'GPLine'),
+  ('Linear Unit', 'GPLinearUnit'),
+  ('Long', 'GPLong'),
+  ('M Domain', 'GPMDomain'),
+  ('MapServer', 'DEMapServer'),
+  ('Mosaic Dataset', 'DEMosaicDataset'),
+  ('Mosaic Layer', 'GPMosaicLayer'),
+  ('Neighborhood', 'GPSANeighborhood'),
+  ('Network Analyst Class FieldMap', 'NAClassFieldMap'),
+  ('Network Analyst Hierarchy Settings', 'GPNAHierarchySettings'),
+  ('Network Analyst Layer', 'GPNALayer'),
+  ('Network Dataset', 'DENetworkDataset'),
+  ('Network Dataset Layer', 'GPNetworkDatasetLayer'),
+  ('Parcel Fabric', 'DECadastralFabric'),
+  ('Parcel Fabric Layer', 'GPCadastralFabricLayer'),
+  ('Point', 'GPPoint'),
+  ('Polygon', 'GPPolygon'),
+  ('Projection File', 'DEPrjFile'),
+  ('Pyramid', 'GPSAGDBEnvPyramid'),
+  ('Radius', 'GPSARadius'),
+  ('Random Number Generator', 'GPRandomNumberGenerator'),
+  ('Raster Band', 'DERasterBand'),
+  ('Raster Calculator Expression', 'GPRasterCalculatorExpression'),
+  ('Raster Catalog', 'DERasterCatalog'),
+  ('Raster Catalog Layer', 'GPRasterCatalogLayer'),
+  ('Raster Data Layer', 'GPRasterDataLayer'),
+  ('Raster Dataset', 'DERasterDataset'),
+  ('Raster Layer', 'GPRasterLayer'),
+  ('Raster Statistics', 'GPSAGDBEnvStatistics'),
+  ('Raster Type', 'GPRasterBuilder'),
+  ('Record Set', 'GPRecordSet'),
+  ('Relationship Class', 'DERelationshipClass'),
+  ('Remap', 'GPSARemap'),
+  ('Route Measure Event Properties', 'GPRouteMeasureEventProperties'),
+  ('Schematic Dataset', 'DESchematicDataset'),
+  ('Schematic Diagram', 'DESchematicDiagram'),
+  ('Schematic Folder', 'DESchematicFolder'),
+  ('Schematic Layer', 'GPSchematicLayer'),
+  ('Semivariogram', 'GPSASemiVariogram'),
+  ('ServerConnection', 'DEServerConnection'),
+  ('Shapefile', 'DEShapefile'),
+  ('Spatial Reference', 'GPSpatialReference'),
+  ('SQL Expression', 'GPSQLExpression'),
+  ('String', 'GPString'),
+  ('Table', 'DETable'),
+  ('Table View', 'GPTableView'),
+  ('Terrain Layer', 'GPTerrainLayer'),
+  ('Text File', 'DETextfile'),
+  ('Tile Size', 'GPSAGDBEnvTileSize'),
+  ('Time configuration', 'GPSATimeConfiguration'),
+  ('TIN', 'DETin'),
+  ('Tin Layer', 'GPTinLayer'),
+  ('Tool', 'DETool'),
+  ('Toolbox', 'DEToolbox'),
+  ('Topo Features', 'GPSATopoFeatures'),
+  ('Topology', 'DETopology'),
+  ('Topology Layer', 'GPTopologyLayer'),
+  ('Value Table', 'GPValueTable'),
+  ('Variant', 'GPVariant'),
+  ('Vertical Factor', 'GPSAVerticalFactor'),
+  ('VPF Coverage', 'DEVPFCoverage'),
+  ('VPF Table', 'DEVPFTable'),
+  ('WCS Coverage', 'DEWCSCoverage'),
+  ('Weighted Overlay Table', 'GPSAWeightedOverlayTable'),
+  ('Weighted Sum', 'GPSAWeightedSum'),
+  ('WMS Map', 'DEWMSMap'),
+  ('Workspace', 'DEWorkspace'),
+  ('XY Domain', 'GPXYDomain'),
+  ('Z Domain', 'GPZDomain'))
+
+
+# Shared instance, built on first use (see get_datatype).
+_datatype = None
+
+
+def get_datatype():
+    """ Get the shared DataType instance, building it on first use. This
+    keeps importing the module (e.g. while ArcGIS loads a .pyt) free of
+    arcpy calls and table construction."""
+    global _datatype
+    if _datatype is None:
+        _datatype = DataType()
+    return _datatype
+
+
+class _LazyDataType(object):
+    """ Stand-in for the module-level `dt`, which forwards every attribute
+    to the shared DataType instance, building it on first access."""
+
+    def __getattr__(self, name):
+        return getattr(get_datatype(), name)
+
+    def __setattr__(self, name, value):
+        setattr(get_datatype(), name, value)
+
+    def __delattr__(self, name):
+        delattr(get_datatype(), name)
+
+    def __repr__(self):
+        return '<lazy %r>' % (_datatype,)
+
+dt = _LazyDataType()
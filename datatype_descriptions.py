@@ -0,0 +1,141 @@
+# datatype_descriptions.py: descriptions of the types in datatype.py
+# -*- coding: utf-8 -*-
+""" Descriptions of every type in datatype.py, pulled from the 10.1
+documentation. They live apart from the type table so that they are only
+loaded when read (see datatype.TypeRecord.description).
+http://resources.arcgis.com/en/help/main/10.1/index.html#//001500000035000000
+"""
+DESCRIPTIONS = {
+  'Address Locator': 'A dataset, used for geocoding, that stores the address attributes, associated indexes, and rules that define the process for translating nonspatial descriptions of places to spatial data.',
+  'Address Locator Style': 'A template on which to base the new address locator.',
+  'Analysis Cell Size': 'The cell size used by raster tools.',
+  'Any Value': 'A data type that accepts any value.',
+  'ArcMap Document': 'A file that contains one map, its layout, and its associated layers, tables, charts, and reports.',
+  'Areal Unit': 'An areal unit type and value such as square meter or acre.',
+  'Boolean': 'A Boolean value.',
+  'CAD Drawing Dataset': 'A vector data source with a mix of feature types with symbology. The dataset is not usable for feature class-based queries or analysis.',
+  'Calculator Expression': 'A calculator expression.',
+  'Catalog Root': 'The top-level node in the Catalog tree.',
+  'Cell Size': 'The cell size used byArcGIS Spatial Analyst extension.',
+  'Cell Size XY': 'Defines the two sides of a raster cell.',
+  'Composite Layer': 'A reference to several children layers, including symbology and rendering properties.',
+  'Compression': 'Specifies the type of compression used for a raster.',
+  'Coordinate System': 'A reference framework&mdash;such as the UTM system&mdash;consisting of a set of points, lines, and/or surfaces, and a set of rules, used to define the positions of points in two- and three-dimensional space.',
+  'Coordinate Systems Folder': 'A folder on disk storing coordinate systems.',
+  'Coverage': 'A coverage dataset, a proprietary data model for storing geographic features as points, arcs, and polygons with associated feature attribute tables.',
+  'Coverage Feature Class': 'A coverage feature class, such as point, arc, node, route, route system, section, polygon, and region.',
+  'Data Element': 'A dataset visible in ArcCatalog.',
+  'Data File': 'A data file.',
+  'Database Connections': 'The database connection folder in ArcCatalog.',
+  'Dataset': 'A collection of related data, usually grouped or stored together.',
+  'Date': 'A date value.',
+  'dBase Table': 'Attribute data stored in dBASE format.',
+  'Decimate': 'Specifies a subset of nodes of a TIN to create a generalized version of that TIN.',
+  'Disk Connection': 'An access path to a data storage device.',
+  'Double': 'Any floating-point number will be stored as a double-precision, 64-bit value.',
+  'Encrypted String': 'Encrypted string for passwords.',
+  'Envelope': 'The coordinate pairs that define the minimum bounding rectangle the data source falls within.',
+  'Evaluation Scale': 'The scale value range and increment value applied to inputs in a weighted overlay operation.',
+  'Extent': 'Specifies the coordinate pairs that define the minimum bounding rectangle (xmin, ymin and xmax, ymax) of a data source. All coordinates for the data source fall within this boundary.',
+  'Extract Values': 'An extract values parameter.',
+  'Feature Class': 'A collection of spatial data with the same shape type: point, multipoint, polyline, and polygon.',
+  'Feature Dataset': 'A collection of feature classes that share a common geographic area and the same spatial reference system.',
+  'Feature Layer': 'A reference to a feature class, including symbology and rendering properties.',
+  'Feature Set': 'Interactive features; draw the features when the tool is run.',
+  'Field': 'A column in a table that stores the values for a single attribute.',
+  'Field Info': 'The details about a field in a FieldMap.',
+  'Field Mappings': 'A collection of fields in one or more input tables.',
+  'File': 'A file on disk.',
+  'Folder': 'Specifies a location on a disk where data is stored.',
+  'Formulated Raster': 'A raster surface whose cell values are represented by a formula or constant.',
+  'Fuzzy function': 'Fuzzy function.',
+  'GeoDataServer': 'A coarse-grained object that references a geodatabase.',
+  'Geodataset': 'A collection of data with a common theme in a geodatabase.',
+  'Geometric Network': 'A linear network represented by topologically connected edge and junction features. Feature connectivity is based on their geometric coincidence.',
+  'Geostatistical Layer': 'A reference to a geostatistical data source, including symbology and rendering properties.',
+  'Geostatistical Search Neighborhood': 'Defines the searching neighborhood parameters for a geostatistical layer.',
+  'Geostatistical Value Table': 'A collection of data sources and fields that define a geostatistical layer.',
+  'GlobeServer': 'A Globe server.',
+  'GPServer': 'A geoprocessing server.',
+  'Graph': 'A graph.',
+  'Graph Data Table': 'A graph data table.',
+  'Group Layer': 'A collection of layers that appear and act as a single layer. Group layers make it easier to organize a map, assign advanced drawing order options, and share layers for use in other maps.',
+  'Horizontal Factor': 'The relationship between the horizontal cost factor and the horizontal relative moving angle.',
+  'Image Service': 'An image service.',
+  'Index': 'A data structure used to speed the search for records in geographic datasets and databases.',
+  'INFO Expression': 'A syntax for defining and manipulating data in an INFO table.',
+  'INFO Item': 'An item in an INFO table.',
+  'INFO Table': 'A table in an INFO database.',
+  'LAS Dataset': 'A LAS dataset stores reference to one or more LAS files on disk, as well as to additional surface features. A LAS file is a binary file that is designed to store airborne lidar data.',
+  'LAS Dataset Layer': 'A layer that references a LAS dataset on disk. This layer can apply filters on lidar files and surface constraints referenced by a LAS dataset.',
+  'Layer': 'A reference to a data source, such as a shapefile, coverage, geodatabase feature class, or raster, including symbology and rendering properties.',
+  'Layer File': 'A file with a .lyr extension that stores the layer definition, including symbology and rendering properties.',
+  'Line': 'A shape, straight or curved, defined by a connected series of unique x,y coordinate pairs.',
+  'Linear Unit': 'A linear unit type and value such as meter or feet.',
+  'Long': 'An integer number value.',
+  'M Domain': 'A range of lowest and highest possible value for m coordinates.',
+  'MapServer': 'A map server.',
+  'Mosaic Dataset': 'A collection of raster and image data that allows you to store, view, and query the data. It is a data model within the geodatabase used to manage a collection of raster datasets (images) stored as a catalog and viewed as a mosaicked image.',
+  'Mosaic Layer': 'A layer that references a mosaic dataset.',
+  'Neighborhood': 'The shape of the area around each cell used to calculate statistics.',
+  'Network Analyst Class FieldMap': 'Mapping between location properties in a Network Analyst layer (such as stops, facilities and incidents) and a point feature class.',
+  'Network Analyst Hierarchy Settings': 'A hierarchy attribute that divides hierarchy values of a network dataset into three groups using two integers. The first integer, high_rank_ends, sets the ending value of the first group; the second number, low_rank_begin, sets the beginning value of the third group.',
+  'Network Analyst Layer': 'A special group layer used to express and solve network routing problems. Each sublayer held in memory in a Network Analyst layer represents some aspect of the routing problem and the routing solution.',
+  'Network Dataset': 'A collection of topologically connected network elements (edges, junctions, and turns), derived from network sources and associated with a collection of network attributes.',
+  'Network Dataset Layer': 'A reference to a network dataset, including symbology and rendering properties.',
+  'Parcel Fabric': 'A parcel fabric is a dataset for the storage, maintenance, and editing of a continuous surface of connected parcels or parcel network.',
+  'Parcel Fabric Layer': 'A layer referencing a parcel fabric on disk. This layer works as a group layer organizing a set of related layers under a single layer.',
+  'Point': 'A pair of x,y coordinates.',
+  'Polygon': 'A connected sequence of x,y coordinate pairs, where the first and last coordinate pair are the same.',
+  'Projection File': 'A file storing coordinate system information for spatial data.',
+  'Pyramid': 'Specifies if pyramids will be built.',
+  'Radius': 'Specifies which surrounding points will be used for interpolation.',
+  'Random Number Generator': 'Specifies the seed and the generator to be used when creating random values.',
+  'Raster Band': 'A layer in a raster dataset.',
+  'Raster Calculator Expression': 'A raster calculator expression.',
+  'Raster Catalog': 'A collection of raster datasets defined in a table; each table record defines an individual raster dataset in the catalog.',
+  'Raster Catalog Layer': 'A reference to a raster catalog, including symbology and rendering properties.',
+  'Raster Data Layer': 'A raster data layer.',
+  'Raster Dataset': 'A single dataset built from one or more rasters.',
+  'Raster Layer': 'A reference to a raster, including symbology and rendering properties.',
+  'Raster Statistics': 'Specifies if raster statistics will be built.',
+  'Raster Type': 'Raster data is added to a mosaic dataset by specifying a raster type. The raster type identifies metadata, such as georeferencing, acquisition date, and sensor type, along with a raster format.',
+  'Record Set': 'Interactive table; type in the table values when the tool is run.',
+  'Relationship Class': 'The details about the relationship between objects in the geodatabase.',
+  'Remap': 'A table that defines how raster cell values will be reclassified.',
+  'Route Measure Event Properties': 'Specifies the fields on a table that describe events that are measured by a linear reference route system.',
+  'Schematic Dataset': 'A schematic dataset contains a collection of schematic diagram templates and schematic feature classes that share the same application domain, for example, water or electrical. It can reside in a personal, file, or ArcSDE geodatabase.',
+  'Schematic Diagram': 'A schematic diagram.',
+  'Schematic Folder': 'A schematic folder.',
+  'Schematic Layer': 'A schematic layer is a composite layer composed of feature layers based on the schematic feature classes associated with the template on which the schematic diagram is based.',
+  'Semivariogram': 'Specifies the distance and direction representing two locations that are used to quantify autocorrelation.',
+  'ServerConnection': 'A server connection.',
+  'Shapefile': 'Spatial data in shapefile format.',
+  'Spatial Reference': 'The coordinate system used to store a spatial dataset, including the spatial domain.',
+  'SQL Expression': 'A syntax for defining and manipulating data from a relational database.',
+  'String': 'A text value.',
+  'Table': 'Tabular data.',
+  'Table View': 'A representation of tabular data for viewing and editing purposes, stored in memory or on disk.',
+  'Terrain Layer': 'A reference to a terrain, including symbology and rendering properties. It\'s used to draw a terrain.',
+  'Text File': 'Data stored in ASCII format.',
+  'Tile Size': 'Specifies the width and the height of a data stored in block.',
+  'Time configuration': 'Specifies the time periods used for calculating solar radiation at specific locations.',
+  'TIN': 'A vector data structure that partitions geographic space into contiguous, nonoverlapping triangles. The vertices of each triangle are sample data points with x-, y-, and z-values.',
+  'Tin Layer': 'A reference to a TIN, including topological relationships, symbology, and rendering properties.',
+  'Tool': 'A geoprocessing tool.',
+  'Toolbox': 'A geoprocessing toolbox.',
+  'Topo Features': 'Features that are input to the interpolation.',
+  'Topology': 'A topology that defines and enforces data integrity rules for spatial data.',
+  'Topology Layer': 'A reference to a topology, including symbology and rendering properties.',
+  'Value Table': 'A collection of columns of values.',
+  'Variant': 'A data value that can contain any basic type: Boolean, date, double, long, and string.',
+  'Vertical Factor': 'Specifies the relationship between the vertical cost factor and the vertical, relative moving angle.',
+  'VPF Coverage': 'Spatial data stored in Vector Product Format.',
+  'VPF Table': 'Attribute data stored in Vector Product Format.',
+  'WCS Coverage': 'Web Coverage Service (WCS) is an open specification for sharing raster datasets on the web.',
+  'Weighted Overlay Table': 'A table with data to combine multiple rasters by applying a common measurement scale of values to each raster, weighing each according to its importance.',
+  'Weighted Sum': 'Specifies data for overlaying several rasters multiplied each by their given weight and then summed.',
+  'WMS Map': 'A WMS Map.',
+  'Workspace': 'A container such as a geodatabase or folder.',
+  'XY Domain': 'A range of lowest and highest possible values for x,y coordinates.',
+  'Z Domain': 'A range of lowest and highest possible values for z coordinates.'}
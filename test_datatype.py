@@ -0,0 +1,734 @@
+# test_datatype.py: tests for datatype.py
+# -*- coding: utf-8 -*-
+""" Tests for datatype.py, run against a stub arcpy module so they work
+outside of an ArcGIS install:
+
+    python -m pytest test_datatype.py
+"""
+import hashlib
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import types
+import unittest
+
+# keep the tests from reading or writing a real cache
+os.environ['DATATYPE_CACHE'] = ''
+
+INSTALL_INFO = {'Version': '10.1', 'SPNumber': '1'}
+
+
+def install_stub_arcpy(install_info=INSTALL_INFO):
+    """ Register a fake arcpy module returning install_info."""
+    arcpy = types.ModuleType('arcpy')
+    arcpy.GetInstallInfo = lambda: dict(install_info)
+    sys.modules['arcpy'] = arcpy
+    return arcpy
+
+install_stub_arcpy()
+import datatype
+from datatype import DataType
+
+
+def install_counting_arcpy(install_info=INSTALL_INFO):
+    """ Register a fake arcpy module counting its GetInstallInfo calls in
+    its `calls` list."""
+    arcpy = install_stub_arcpy(install_info)
+    arcpy.calls = []
+
+    def GetInstallInfo():
+        arcpy.calls.append(1)
+        return dict(install_info)
+    arcpy.GetInstallInfo = GetInstallInfo
+    return arcpy
+
+
+class LazyTest(unittest.TestCase):
+
+    def setUp(self):
+        datatype._install_info = None
+        datatype._datatype = None
+        self.arcpy = install_counting_arcpy()
+
+    def tearDown(self):
+        datatype._install_info = None
+        datatype._datatype = None
+        install_stub_arcpy()
+
+    def test_import_calls_nothing(self):
+        # a fresh process, where the module isn't imported yet
+        script = (
+            'import sys, types\n'
+            'calls = []\n'
+            'arcpy = sys.modules["arcpy"] = types.ModuleType("arcpy")\n'
+            'arcpy.GetInstallInfo = lambda: calls.append(1) or %r\n'
+            'import datatype\n'
+            'print("%%d %%s" %% (len(calls), datatype._datatype))\n'
+            % (INSTALL_INFO,))
+        env = dict(os.environ, DATATYPE_CACHE='')
+        output = subprocess.check_output(
+            [sys.executable, '-c', script], env=env,
+            cwd=os.path.dirname(os.path.abspath(datatype.__file__)))
+        self.assertEqual(output.decode('ascii').split(), ['0', 'None'])
+
+    def test_dt_built_on_first_access(self):
+        self.assertEqual(datatype._datatype, None)
+        self.assertEqual(self.arcpy.calls, [])
+        self.assertEqual(datatype.dt.normalize('Long'), 'GPLong')
+        self.assertTrue(isinstance(datatype._datatype, DataType))
+        self.assertTrue(datatype.get_datatype() is datatype._datatype)
+
+    def test_install_info_fetched_once(self):
+        datatype.dt.normalize('Long')
+        DataType()
+        DataType().normalize('Feature Class')
+        datatype.dt.convention
+        datatype.get_install_info()
+        self.assertEqual(len(self.arcpy.calls), 1)
+
+
+class TypeIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dt = DataType(INSTALL_INFO)
+
+    def test_shared_keyword_converts_to_first_label(self):
+        # GPGALayer is both labels; the first in documentation order wins
+        self.assertEqual(self.dt.keyword_to_label('GPGALayer'),
+                         'Geostatistical Layer')
+        self.assertEqual(self.dt.keyword_to_labels('GPGALayer'),
+                         ('Geostatistical Layer',
+                          'Geostatistical Value Table'))
+
+    def test_unknown_keyword(self):
+        self.assertEqual(self.dt.keyword_to_label('GPNoSuchType'), None)
+        self.assertEqual(self.dt.keyword_to_labels('GPNoSuchType'), ())
+
+    def test_label_to_keyword(self):
+        self.assertEqual(self.dt.label_to_keyword('Feature Class'),
+                         'DEFeatureClass')
+        self.assertRaises(KeyError, self.dt.label_to_keyword, 'No Such')
+
+    def test_membership(self):
+        index = self.dt.index
+        self.assertTrue(isinstance(index.label_set, frozenset))
+        self.assertTrue(isinstance(index.keyword_set, frozenset))
+        self.assertTrue('Feature Class' in index.label_set)
+        self.assertTrue('DEFeatureClass' in index.keyword_set)
+        self.assertFalse('DEFeatureClass' in index.label_set)
+        self.assertFalse('Feature Class' in index.keyword_set)
+        self.assertTrue('Feature Class' in self.dt.labels)
+        self.assertTrue('GPGALayer' in self.dt.keywords)
+
+    def test_records_in_table_order(self):
+        self.assertEqual(
+            [(r.label, r.keyword) for r in self.dt.index.records],
+            list(datatype._TYPES))
+
+    def test_index_is_shared(self):
+        self.assertTrue(DataType(INSTALL_INFO).index is self.dt.index)
+
+class TypeRecordTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dt = DataType(INSTALL_INFO)
+        # forget the descriptions, to see when they are loaded
+        datatype._descriptions = None
+        sys.modules.pop('datatype_descriptions', None)
+
+    def assertDescriptionsLoaded(self, loaded):
+        self.assertEqual('datatype_descriptions' in sys.modules, loaded)
+
+    def test_slots(self):
+        record = self.dt.types['Long']
+        self.assertFalse(hasattr(record, '__dict__'))
+        self.assertRaises(AttributeError, setattr, record, 'extra', 1)
+
+    def test_dictionary_access(self):
+        record = self.dt.types['Feature Class']
+        self.assertEqual(record['keyword'], 'DEFeatureClass')
+        self.assertEqual(record['label'], 'Feature Class')
+        self.assertEqual(record['description'], record.description)
+        self.assertRaises(KeyError, lambda: record['name'])
+
+    def test_descriptions_loaded_on_read(self):
+        self.dt.types['Long']
+        list(self.dt.labels)
+        list(self.dt.keywords)
+        self.dt.normalize('Long')
+        self.assertDescriptionsLoaded(False)
+        self.assertEqual(self.dt.types['Workspace'].description,
+                         'A container such as a geodatabase or folder.')
+        self.assertDescriptionsLoaded(True)
+
+    def test_get_descriptions_loads(self):
+        self.assertDescriptionsLoaded(False)
+        descriptions = self.dt.get_descriptions()
+        self.assertDescriptionsLoaded(True)
+        self.assertEqual(len(descriptions), len(datatype._TYPES))
+        self.assertTrue(all(descriptions))
+
+    def test_given_description_not_loaded(self):
+        record = datatype.TypeRecord('Chain 0', 'GPChain', 'A chain.')
+        self.assertEqual(record.description, 'A chain.')
+        self.assertDescriptionsLoaded(False)
+
+    def test_views_read_only(self):
+        def assign(view, key):
+            view[key] = None
+
+        def delete(view, key):
+            del view[key]
+        self.assertRaises(TypeError, assign, self.dt.types, 'Long')
+        self.assertRaises(TypeError, delete, self.dt.types, 'Long')
+        for view in (self.dt.labels, self.dt.keywords,
+                     self.dt.descriptions):
+            self.assertRaises(TypeError, assign, view, 0)
+            self.assertRaises(TypeError, delete, view, 0)
+            self.assertFalse(hasattr(view, 'append'))
+        for name in ('types', 'labels', 'keywords', 'descriptions'):
+            self.assertRaises(AttributeError, setattr, self.dt, name, [])
+
+    def test_views_match_lists(self):
+        self.assertEqual(list(self.dt.labels), self.dt.get_labels())
+        self.assertEqual(list(self.dt.keywords), self.dt.get_keywords())
+        self.assertEqual(list(self.dt.descriptions),
+                         self.dt.get_descriptions())
+        self.assertEqual(self.dt.labels[:2],
+                         ['Address Locator', 'Address Locator Style'])
+
+    def test_types_match_10_1_table(self):
+        types = self.dt.get_types()
+        self.assertEqual(len(types), 133)
+        self.assertEqual(types['Analysis Cell Size'], {
+            'keyword': 'analysis_cell_size',
+            'description': 'The cell size used by raster tools.'})
+        self.assertEqual(types['Z Domain'], {
+            'keyword': 'GPZDomain',
+            'description': 'A range of lowest and highest possible values '
+                           'for z coordinates.'})
+        self.assertEqual(
+            set(types), set(datatype._type_descriptions()))
+        # digest of the dictionary get_types() returned before the table
+        # was split into records and descriptions
+        table = sorted((label, t['keyword'], t['description'])
+                       for (label, t) in types.items())
+        self.assertEqual(
+            hashlib.sha1(repr(table).encode('utf-8')).hexdigest(),
+            'cecda8ded084288702797dbd6b49ab3c977801c5')
+
+
+class ReleasePolicyTest(unittest.TestCase):
+    # (install info, convention, normalized 'Feature Class',
+    #  normalized 'DEFeatureClass', normalized 'GPGALayer')
+    RELEASES = [
+        ({'Version': '10.0', 'SPNumber': 'N/A'}, datatype.LABEL,
+         'Feature Class', 'Feature Class', 'Geostatistical Layer'),
+        ({'Version': '10.1', 'SPNumber': 'N/A'}, datatype.LABEL,
+         'Feature Class', 'Feature Class', 'Geostatistical Layer'),
+        ({'Version': '10.1', 'SPNumber': '1'}, datatype.KEYWORD,
+         'DEFeatureClass', 'DEFeatureClass', 'GPGALayer'),
+        ({'Version': '10.1', 'SPNumber': '2'}, datatype.KEYWORD,
+         'DEFeatureClass', 'DEFeatureClass', 'GPGALayer'),
+        ({'Version': '10.2.2', 'SPNumber': 'N/A'}, datatype.KEYWORD,
+         'DEFeatureClass', 'DEFeatureClass', 'GPGALayer'),
+        ({'Version': '10.8', 'SPNumber': 'N/A'}, datatype.KEYWORD,
+         'DEFeatureClass', 'DEFeatureClass', 'GPGALayer'),
+        ({'Version': '2.9.0', 'SPNumber': 'N/A', 'ProductName': 'ArcGISPro'},
+         datatype.KEYWORD, 'DEFeatureClass', 'DEFeatureClass', 'GPGALayer'),
+        ({'Version': '3.1', 'SPNumber': 'N/A', 'ProductName': 'ArcGISPro'},
+         datatype.KEYWORD, 'DEFeatureClass', 'DEFeatureClass', 'GPGALayer'),
+        # unparseable versions pass datatypes through unchanged
+        ({'Version': 'unknown', 'SPNumber': 'N/A'}, None,
+         'Feature Class', 'DEFeatureClass', 'GPGALayer'),
+    ]
+
+    def test_releases(self):
+        for (info, convention, label, keyword, shared) in self.RELEASES:
+            dt = DataType(info)
+            self.assertEqual(dt.convention, convention, info)
+            self.assertEqual(dt.normalize('Feature Class'), label, info)
+            self.assertEqual(dt.normalize('DEFeatureClass'), keyword, info)
+            self.assertEqual(dt.normalize('GPGALayer'), shared, info)
+            self.assertEqual(dt.normalize('No Such Type'), None, info)
+
+    def test_parse_release(self):
+        self.assertEqual(datatype.parse_release('10.1', 'N/A'),
+                         (10, 1, 0, 0))
+        self.assertEqual(datatype.parse_release('10.1', '1'), (10, 1, 0, 1))
+        self.assertEqual(datatype.parse_release('10.2.2'), (10, 2, 2, 0))
+        self.assertEqual(datatype.parse_release('Pro'), None)
+        self.assertTrue(datatype.parse_release('10.1', '1') >
+                        datatype.parse_release('10.1', 'N/A'))
+
+    def test_default_install(self):
+        # with no install info, the (stub) arcpy install is used
+        self.assertEqual(DataType().convention, datatype.KEYWORD)
+
+
+class ResolverTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dt = DataType(INSTALL_INFO)
+
+    def test_resolve(self):
+        self.assertEqual(self.dt.resolve(' feature  CLASS'), 'Feature Class')
+        self.assertEqual(self.dt.resolve('defeatureclass'), 'DEFeatureClass')
+        self.assertEqual(self.dt.resolve(None), None)
+
+    def test_suggest_names_each_type_once(self):
+        # 'DEFeatureClass' scores too, but names the same type
+        suggestions = self.dt.suggest('FeatureClas', 20)
+        self.assertEqual(suggestions[0], 'Feature Class')
+        self.assertFalse('DEFeatureClass' in suggestions)
+        types = [self.dt.index.resolver().by_type[datatype.fold(s)]
+                 for s in suggestions]
+        self.assertEqual(len(types), len(set(types)))
+
+    def test_suggest_limit(self):
+        self.assertEqual(len(self.dt.suggest('Layer', 3)), 3)
+        self.assertEqual(self.dt.suggest(None), [])
+
+    def test_complete(self):
+        self.assertEqual(self.dt.complete('feature'),
+                         ['Feature Class', 'Feature Dataset', 'Feature Layer',
+                          'Feature Set'])
+        self.assertEqual(self.dt.complete('feature', 2),
+                         ['Feature Class', 'Feature Dataset'])
+        self.assertEqual(self.dt.complete('No Such'), [])
+        self.assertEqual(self.dt.complete(None), [])
+
+
+class CacheTest(unittest.TestCase):
+    """ The on-disk cache, with a fake arcpy package that can be located
+    without importing it."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        package = os.path.join(self.directory, 'arcpy')
+        os.mkdir(package)
+        self.init = os.path.join(package, '__init__.py')
+        self.write_arcpy(INSTALL_INFO)
+        sys.modules.pop('arcpy', None)
+        sys.path.insert(0, self.directory)
+        self.path = os.path.join(self.directory, 'cache', 'datatype.cache')
+        self.index = DataType(INSTALL_INFO).index
+
+    def tearDown(self):
+        sys.path.remove(self.directory)
+        shutil.rmtree(self.directory)
+        install_stub_arcpy()
+        datatype._install_info = None
+        datatype._cache = None
+        os.environ['DATATYPE_CACHE'] = ''
+
+    def write_arcpy(self, install_info, mtime=None):
+        with open(self.init, 'w') as init:
+            init.write('def GetInstallInfo():\n'
+                       '    return %r\n' % (install_info,))
+        if mtime is not None:
+            os.utime(self.init, (mtime, mtime))
+
+    def test_round_trip(self):
+        self.assertTrue(datatype.save_cache(self.index, INSTALL_INFO,
+                                            self.path))
+        cache = datatype.load_cache(self.index, self.path)
+        self.assertEqual(cache['install_info'], INSTALL_INFO)
+        self.assertEqual(cache['convention'], datatype.KEYWORD)
+        self.assertEqual(cache['translation']['Feature Class'],
+                         'DEFeatureClass')
+
+    def test_stale_after_arcpy_changes(self):
+        datatype.save_cache(self.index, INSTALL_INFO, self.path)
+        self.write_arcpy({'Version': '10.2', 'SPNumber': 'N/A'},
+                         time.time() + 10)
+        self.assertEqual(datatype.load_cache(self.index, self.path), None)
+
+    def test_corrupt(self):
+        os.mkdir(os.path.dirname(self.path))
+        with open(self.path, 'wb') as cache_file:
+            cache_file.write(b'\x00not marshal data')
+        self.assertEqual(datatype.load_cache(self.index, self.path), None)
+
+    def test_missing(self):
+        self.assertEqual(datatype.load_cache(self.index, self.path), None)
+
+    @unittest.skipUnless(hasattr(os, 'getuid'), 'POSIX permissions')
+    def test_writable_by_others(self):
+        datatype.save_cache(self.index, INSTALL_INFO, self.path)
+        os.chmod(self.path, 0o666)
+        self.assertEqual(datatype.load_cache(self.index, self.path), None)
+
+    def test_disabled(self):
+        os.environ['DATATYPE_CACHE'] = ''
+        self.assertEqual(datatype.cache_path(self.index), None)
+        self.assertFalse(datatype.save_cache(self.index, INSTALL_INFO))
+        self.assertEqual(datatype.load_cache(self.index), None)
+
+    def test_default_path_is_per_user(self):
+        del os.environ['DATATYPE_CACHE']
+        path = datatype.cache_path(self.index)
+        self.assertTrue(path.startswith(os.path.expanduser('~')) or
+                        'XDG_CACHE_HOME' in os.environ or
+                        'LOCALAPPDATA' in os.environ, path)
+        self.assertFalse(path.startswith(tempfile.gettempdir()), path)
+
+    def test_loads_without_importing_arcpy(self):
+        os.environ['DATATYPE_CACHE'] = self.path
+        datatype._install_info = None
+        # the first process imports arcpy and writes the cache
+        self.assertEqual(datatype.get_install_info(self.index), INSTALL_INFO)
+        self.assertTrue(os.path.exists(self.path))
+        # the next one loads it without importing arcpy
+        sys.modules.pop('arcpy', None)
+        datatype._install_info = None
+        self.assertEqual(datatype.get_install_info(self.index), INSTALL_INFO)
+        self.assertFalse('arcpy' in sys.modules)
+
+
+class OverlayTest(unittest.TestCase):
+
+    def setUp(self):
+        self.records = [datatype.TypeRecord('Chain 0', 'GPChain')]
+
+    def test_applies_to(self):
+        overlay = datatype.TypeOverlay(self.records, '10.2')
+        self.assertFalse(overlay.applies_to(INSTALL_INFO))
+        self.assertTrue(overlay.applies_to(
+            {'Version': '10.2.2', 'SPNumber': 'N/A'}))
+        self.assertFalse(overlay.applies_to(
+            {'Version': 'unknown', 'SPNumber': 'N/A'}))
+        pro = datatype.TypeOverlay(self.records, product='ArcGISPro')
+        self.assertFalse(pro.applies_to(INSTALL_INFO))
+
+    def test_version_without_numbers(self):
+        self.assertRaises(ValueError, datatype.TypeOverlay, self.records,
+                          'next')
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'overlay.json')
+            with open(path, 'w') as handle:
+                handle.write('{"version": "Pro", "types": '
+                             '[{"label": "Chain 0", "keyword": "GPChain"}]}')
+            self.assertRaises(ValueError, datatype.TypeOverlay.load, path)
+        finally:
+            shutil.rmtree(directory)
+
+
+class MergeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = DataType(INSTALL_INFO).index
+        # compile the tables merge patches rather than rebuilds
+        for convention in (datatype.LABEL, datatype.KEYWORD):
+            self.index.translation(convention)
+
+    def assertMatchesRebuild(self, merged, records):
+        combined = dict((r.label, r) for r in self.index.records)
+        combined.update((r.label, r) for r in records)
+        rebuilt = datatype.TypeIndex(combined.values())
+        self.assertEqual(merged.records, rebuilt.records)
+        self.assertEqual(merged.by_label, rebuilt.by_label)
+        self.assertEqual(merged.by_keyword, rebuilt.by_keyword)
+        self.assertEqual(merged.label_set, rebuilt.label_set)
+        self.assertEqual(merged.keyword_set, rebuilt.keyword_set)
+        for convention in (datatype.LABEL, datatype.KEYWORD):
+            self.assertEqual(dict(merged.translation(convention)),
+                             dict(rebuilt.translation(convention)))
+
+    def test_added_label_keeps_builtin_conversion(self):
+        # 'Chain 0' sorts before 'Feature Layer', but is added
+        records = [datatype.TypeRecord('Chain 0', 'GPFeatureLayer')]
+        merged = self.index.merge(records)
+        self.assertEqual(merged.by_keyword['GPFeatureLayer'],
+                         ('Feature Layer', 'Chain 0'))
+        self.assertEqual(
+            merged.translation(datatype.LABEL)['GPFeatureLayer'],
+            'Feature Layer')
+        self.assertEqual(merged.translation(datatype.LABEL)['Chain 0'],
+                         'Chain 0')
+        self.assertMatchesRebuild(merged, records)
+
+    def test_matches_rebuild(self):
+        records = [
+            datatype.TypeRecord('Chain 0', 'GPFeatureLayer'),
+            datatype.TypeRecord('Aardvark', 'GPGALayer'),
+            datatype.TypeRecord('Zebra Table', 'GPZebraTable'),
+            # moves a built-in label to another keyword
+            datatype.TypeRecord('Feature Set', 'GPFeatureLayer'),
+        ]
+        self.assertMatchesRebuild(self.index.merge(records), records)
+
+    def test_large_merge_matches_rebuild(self):
+        # more records than the index, so merge rebuilds from scratch
+        records = [datatype.TypeRecord('Type %d' % i, 'GPType%d' % (i % 7))
+                   for i in range(len(self.index.records) + 1)]
+        records.append(datatype.TypeRecord('Chain 0', 'GPFeatureLayer'))
+        self.assertMatchesRebuild(self.index.merge(records), records)
+        # and in between, sorting the added records in
+        self.assertMatchesRebuild(self.index.merge(records[:40]),
+                                  records[:40])
+
+
+class StatsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dt = DataType(INSTALL_INFO)
+        self.stats = self.dt.enable_stats()
+
+    def tearDown(self):
+        os.environ.pop('DATATYPE_STATS', None)
+
+    def methods(self):
+        return self.stats.snapshot()['methods']
+
+    def test_percentiles(self):
+        stats = datatype.LookupStats()
+        for seconds in (6.0, 2.0, 4.0, 1.0, 5.0, 3.0):
+            stats.record('normalize', seconds, 'hit')
+        summary = stats.snapshot()['methods']['normalize']
+        self.assertEqual(summary['calls'], 6)
+        self.assertEqual(summary['seconds'], 21.0)
+        self.assertEqual(summary['mean'], 3.5)
+        self.assertEqual((summary['p50'], summary['p90'], summary['p99'],
+                          summary['max']), (3.0, 6.0, 6.0, 6.0))
+
+    def test_percentiles_over_latest_samples(self):
+        stats = datatype.LookupStats(samples=3)
+        for seconds in (9.0, 1.0, 2.0, 3.0):
+            stats.record('normalize', seconds, 'hit')
+        summary = stats.snapshot()['methods']['normalize']
+        self.assertEqual(summary['calls'], 4)
+        self.assertEqual((summary['p50'], summary['max']), (2.0, 3.0))
+
+    def test_reset(self):
+        self.dt.normalize('Bad')
+        self.stats.reset()
+        self.assertEqual(self.stats.snapshot(),
+                         {'methods': {}, 'unknown': {}})
+
+    def test_normalize_outcomes(self):
+        for raw_type in ('Long', 'GPLong', ' long', 'Bad', 'Bad'):
+            self.dt.normalize(raw_type)
+        normalize = self.methods()['normalize']
+        self.assertEqual((normalize['calls'], normalize['hit'],
+                          normalize['miss'], normalize['unknown']),
+                         (5, 2, 1, 2))
+        self.assertEqual(self.stats.snapshot()['unknown'], {'Bad': 2})
+
+    def test_conversion_tallies(self):
+        self.dt.keyword_to_label('GPLong')
+        self.dt.keyword_to_label('GPNoSuchType')
+        self.dt.label_to_keyword('Long')
+        self.assertRaises(KeyError, self.dt.label_to_keyword, 'No Such')
+        methods = self.methods()
+        self.assertEqual(
+            (methods['keyword_to_label']['hit'],
+             methods['keyword_to_label']['unknown']), (1, 1))
+        self.assertEqual(
+            (methods['label_to_keyword']['hit'],
+             methods['label_to_keyword']['unknown']), (1, 1))
+        self.assertEqual(self.stats.snapshot()['unknown'],
+                         {'GPNoSuchType': 1, 'No Such': 1})
+
+    def test_called_by_keyword(self):
+        # the instrumented methods take the same arguments as the plain ones
+        self.assertEqual(self.dt.normalize(raw_type='Long'), 'GPLong')
+        self.assertEqual(self.dt.keyword_to_label(keyword='GPLong'), 'Long')
+        self.assertEqual(self.dt.label_to_keyword(label='Long'), 'GPLong')
+        self.assertEqual(self.dt.keyword_to_label(), None)
+        methods = self.methods()
+        self.assertEqual(methods['normalize']['hit'], 1)
+        self.assertEqual(methods['keyword_to_label']['calls'], 2)
+        self.assertEqual(methods['label_to_keyword']['hit'], 1)
+
+    def test_disable(self):
+        self.dt.disable_stats()
+        self.dt.normalize('Long')
+        self.assertEqual(self.methods(), {})
+        self.assertFalse('normalize' in self.dt.__dict__)
+
+    def test_environment(self):
+        self.assertEqual(DataType(INSTALL_INFO).stats, None)
+        os.environ['DATATYPE_STATS'] = '1'
+        dt = DataType(INSTALL_INFO)
+        self.assertTrue(isinstance(dt.stats, datatype.LookupStats))
+        dt.normalize('Long')
+        self.assertEqual(dt.stats.snapshot()['methods']['normalize']['hit'],
+                         1)
+
+
+class OverlayFileTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, name, text, encoding='utf-8'):
+        path = os.path.join(self.directory, name)
+        with io.open(path, 'w', encoding=encoding, newline='') as handle:
+            handle.write(text)
+        return path
+
+    def test_json_list(self):
+        path = self.write('overlay.json', u'[{"label": "Chain 0", '
+                          u'"keyword": "GPChain", "description": "A chain."}]')
+        overlay = datatype.TypeOverlay.load(path)
+        self.assertEqual([(r.label, r.keyword) for r in overlay.records],
+                         [('Chain 0', 'GPChain')])
+        self.assertEqual(overlay.records[0].description, 'A chain.')
+        self.assertEqual((overlay.version, overlay.product, overlay.name),
+                         (None, None, path))
+
+    def test_json_object(self):
+        path = self.write('overlay.json', u'{"version": "2.5", '
+                          u'"product": "ArcGISPro", "types": '
+                          u'[{"label": "Chain 0", "keyword": "GPChain"}]}')
+        overlay = datatype.TypeOverlay.load(path)
+        self.assertEqual((overlay.version, overlay.product),
+                         ('2.5', 'ArcGISPro'))
+        # arguments override the file
+        overlay = datatype.TypeOverlay.load(path, '3.0', 'Other')
+        self.assertEqual((overlay.version, overlay.product), ('3.0', 'Other'))
+
+    def test_csv(self):
+        path = self.write('overlay.csv', u'label,keyword,description\r\n'
+                          u'Chain 0,GPChain,"A chain, of links."\r\n'
+                          u'Chain 1,GPChain1,\r\n')
+        overlay = datatype.TypeOverlay.load(path)
+        self.assertEqual([(r.label, r.keyword) for r in overlay.records],
+                         [('Chain 0', 'GPChain'), ('Chain 1', 'GPChain1')])
+        self.assertEqual([r.description for r in overlay.records],
+                         ['A chain, of links.', ''])
+
+    def test_csv_byte_order_mark(self):
+        # as exported by Excel
+        path = self.write('overlay.csv', u'label,keyword\r\nChain 0,GPChain\r\n',
+                          'utf-8-sig')
+        overlay = datatype.TypeOverlay.load(path)
+        self.assertEqual(overlay.records[0].label, 'Chain 0')
+
+    def test_labels_native_strings(self):
+        path = self.write('overlay.json',
+                          u'[{"label": "Chain 0", "keyword": "GPChain"}]')
+        record = datatype.TypeOverlay.load(path).records[0]
+        self.assertTrue(isinstance(record.label, str))
+        self.assertTrue(isinstance(record.keyword, str))
+
+    def test_non_ascii(self):
+        label = u'R\xe9seau'
+        json_path = self.write('overlay.json', u'[{"label": "R\xe9seau", '
+                               u'"keyword": "GPReseau"}]')
+        csv_path = self.write('overlay.csv',
+                              u'label,keyword\r\nR\xe9seau,GPReseau\r\n')
+        for path in (json_path, csv_path):
+            dt = DataType(INSTALL_INFO, [path])
+            self.assertEqual(dt.types[label].keyword, 'GPReseau')
+            self.assertEqual(dt.normalize(label), 'GPReseau')
+            self.assertEqual(dt.keyword_to_label('GPReseau'), label)
+
+    def test_load_overlay_reused_until_changed(self):
+        path = self.write('overlay.json',
+                          u'[{"label": "Chain 0", "keyword": "GPChain"}]')
+        overlay = datatype.load_overlay(path)
+        self.assertTrue(datatype.load_overlay(path) is overlay)
+        self.assertTrue(DataType(INSTALL_INFO, [path]).index is
+                        DataType(INSTALL_INFO, [path]).index)
+        mtime = os.stat(path).st_mtime + 10
+        os.utime(path, (mtime, mtime))
+        changed = datatype.load_overlay(path)
+        self.assertFalse(changed is overlay)
+        self.assertEqual(changed.records, overlay.records)
+
+    def test_datatype_overlays(self):
+        path = self.write('overlay.json', u'{"version": "10.2", "types": '
+                          u'[{"label": "Chain 0", "keyword": "GPChain"}]}')
+        dt = DataType(INSTALL_INFO, [path])
+        self.assertFalse('Chain 0' in dt.types)
+        self.assertEqual(dt.normalize('Chain 0'), None)
+        self.assertFalse(dt.load_overlay(path))
+        dt = DataType({'Version': '10.2', 'SPNumber': 'N/A'}, [path])
+        self.assertTrue('Chain 0' in dt.types)
+        self.assertEqual(dt.normalize('Chain 0'), 'GPChain')
+        self.assertTrue('Chain 0' in dt.get_types())
+        self.assertFalse('Chain 0' in DataType(INSTALL_INFO).types)
+        # an overlay object works as well as a path
+        dt = DataType(INSTALL_INFO)
+        self.assertTrue(dt.load_overlay(datatype.TypeOverlay(
+            [datatype.TypeRecord('Chain 0', 'GPChain')])))
+        self.assertEqual(dt.normalize('Chain 0'), 'GPChain')
+
+
+class Parameter(object):
+    """ Stands in for arcpy.Parameter."""
+
+    def __init__(self, datatype):
+        self.datatype = datatype
+
+
+class NormalizeManyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dt = DataType(INSTALL_INFO)
+
+    def test_in_order(self):
+        self.assertEqual(
+            self.dt.normalize_many(['Feature Class', 'GPLong', 'Double']),
+            ['DEFeatureClass', 'GPLong', 'GPDouble'])
+
+    def test_unknown_reported_together(self):
+        try:
+            self.dt.normalize_many(['Long', 'Bad', 'Worse'])
+        except datatype.UnknownDataTypeError as e:
+            self.assertEqual(e.unknown, ('Bad', 'Worse'))
+        else:
+            self.fail('UnknownDataTypeError not raised')
+
+    def test_unknown_not_strict(self):
+        self.assertEqual(
+            self.dt.normalize_many(['Long', 'Bad'], strict=False),
+            ['GPLong', None])
+
+    def test_parameters(self):
+        params = [Parameter('Feature Layer'), Parameter(['Long', 'GPDouble'])]
+        self.assertTrue(self.dt.normalize_parameters(params)[0] is params[0])
+        self.assertEqual([p.datatype for p in params],
+                         ['GPFeatureLayer', ['GPLong', 'GPDouble']])
+
+    def test_parameters_unknown_not_strict(self):
+        # unknown datatypes keep their original value
+        params = [Parameter('Bad'), Parameter(['Long', 'Worse'])]
+        self.dt.normalize_parameters(params, strict=False)
+        self.assertEqual([p.datatype for p in params],
+                         ['Bad', ['GPLong', 'Worse']])
+
+    def test_stats_count_each_datatype(self):
+        stats = self.dt.enable_stats()
+        self.dt.normalize_many(['Feature Class', 'feature class', 'Bad'],
+                               strict=False)
+        self.dt.normalize_parameters([Parameter(['GPLong', 'Worse'])],
+                                     strict=False)
+        snapshot = stats.snapshot()
+        normalize = snapshot['methods']['normalize']
+        self.assertEqual(normalize['calls'], 5)
+        self.assertEqual((normalize['hit'], normalize['miss'],
+                          normalize['unknown']), (2, 1, 2))
+        self.assertEqual(snapshot['unknown'], {'Bad': 1, 'Worse': 1})
+        self.dt.disable_stats()
+        self.dt.normalize_many(['Long'])
+        self.assertEqual(stats.snapshot()['methods']['normalize']['calls'], 5)
+
+    def test_parameters_unknown_strict(self):
+        params = [Parameter('Bad'), Parameter('Long')]
+        self.assertRaises(datatype.UnknownDataTypeError,
+                          self.dt.normalize_parameters, params)
+        self.assertEqual([p.datatype for p in params], ['Bad', 'Long'])
+
+if __name__ == '__main__':
+    unittest.main()
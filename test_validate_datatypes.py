@@ -0,0 +1,238 @@
+# test_validate_datatypes.py: tests for validate_datatypes.py
+# -*- coding: utf-8 -*-
+""" Tests for validate_datatypes.py, which needs no arcpy:
+
+    python -m pytest test_validate_datatypes.py
+"""
+import ast
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# keep the tests from reading or writing a real cache
+os.environ['DATATYPE_CACHE'] = ''
+
+import validate_datatypes
+from validate_datatypes import (RELEASES, check_datatype, find_datatypes,
+                                release_info)
+from datatype import DataType
+
+SOURCE = '''
+import arcpy
+from datatype import dt
+
+a = arcpy.Parameter('a', 'A', 'Input', 'Feature Class')
+b = arcpy.Parameter(name='b', datatype='GPLong')
+c = Parameter('c', 'C', 'Input', ['Long', 'GPDouble'])
+d = arcpy.Parameter('d', 'D', 'Input', dt.normalize('Raster Layer'))
+e = arcpy.Parameter('e', 'E', 'Input', datatype=kind)
+a.datatype = ('Field', dt.normalize('GPString'))
+other.Call('x', 'y', 'z', 'Not A Datatype')
+'''
+
+
+def datatypes(source):
+    """ (line, value, normalized) of each datatype found in source, where
+    value is the literal string or None for dynamic values."""
+    found = [(node.lineno, validate_datatypes._string_value(node), normalized)
+             for (node, normalized) in find_datatypes(ast.parse(source))]
+    return sorted(found, key=lambda f: (f[0], f[1] or ''))
+
+
+class FindDatatypesTest(unittest.TestCase):
+
+    def test_find(self):
+        self.assertEqual(datatypes(SOURCE), [
+            (5, 'Feature Class', False),
+            (6, 'GPLong', False),
+            (7, 'GPDouble', False),
+            (7, 'Long', False),
+            (8, 'Raster Layer', True),
+            (9, None, False),
+            (10, 'Field', False),
+            (10, 'GPString', True),
+        ])
+
+    def test_string_value(self):
+        def value(source):
+            node = ast.parse(source).body[0].value
+            return validate_datatypes._string_value(node)
+        self.assertEqual(value("'Feature Class'"), 'Feature Class')
+        self.assertEqual(value("u'Feature Class'"), 'Feature Class')
+        self.assertEqual(value('3'), None)
+        self.assertEqual(value('kind'), None)
+
+    def test_short_call(self):
+        # too few arguments to include a datatype
+        self.assertEqual(datatypes("arcpy.Parameter('a', 'A', 'Input')"), [])
+
+
+class CheckDatatypeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.label = DataType(RELEASES['10.1'])
+        self.keyword = DataType(RELEASES['10.1 SP1'])
+
+    def test_ok(self):
+        self.assertEqual(check_datatype('Feature Class', self.label),
+                         {'status': 'ok'})
+        self.assertEqual(check_datatype('DEFeatureClass', self.keyword),
+                         {'status': 'ok'})
+
+    def test_convert(self):
+        self.assertEqual(check_datatype('Feature Class', self.keyword),
+                         {'status': 'convert', 'expected': 'DEFeatureClass'})
+        self.assertEqual(check_datatype('DEFeatureClass', self.label),
+                         {'status': 'convert', 'expected': 'Feature Class'})
+
+    def test_variant(self):
+        self.assertEqual(check_datatype('feature class', self.keyword),
+                         {'status': 'variant', 'expected': 'DEFeatureClass'})
+
+    def test_normalized(self):
+        # converted at run time, so only needs to be known
+        for raw_type in ('Feature Class', 'feature class'):
+            self.assertEqual(
+                check_datatype(raw_type, self.keyword, normalized=True),
+                {'status': 'ok'})
+
+    def test_unknown(self):
+        result = check_datatype('Featur Clas', self.keyword)
+        self.assertEqual(result['status'], 'unknown')
+        self.assertEqual(result['suggestions'][0], 'Feature Class')
+        result = check_datatype('Featur Clas', self.keyword, normalized=True)
+        self.assertEqual(result['status'], 'unknown')
+
+
+class ReleaseTest(unittest.TestCase):
+
+    def test_named(self):
+        self.assertEqual(release_info('10.1 SP1'),
+                         {'Version': '10.1', 'SPNumber': '1'})
+        self.assertEqual(release_info('Pro 3.0')['ProductName'], 'ArcGISPro')
+
+    def test_versions(self):
+        self.assertEqual(release_info('10.2.1'),
+                         {'Version': '10.2.1', 'SPNumber': 'N/A'})
+        self.assertEqual(release_info('10.0 SP5'),
+                         {'Version': '10.0', 'SPNumber': '5'})
+        self.assertEqual(release_info('Pro 3.1'),
+                         {'Version': '3.1', 'SPNumber': 'N/A',
+                          'ProductName': 'ArcGISPro'})
+        for release in ('Pro', 'latest', '10.1 sp1', ''):
+            self.assertRaises(ValueError, release_info, release)
+
+    def test_pro_overlay(self):
+        overlay = validate_datatypes.load_overlay
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'pro.json')
+            with io.open(path, 'w', encoding='utf-8') as handle:
+                handle.write(u'{"version": "3.0", "product": "ArcGISPro", '
+                             u'"types": [{"label": "Chain 0", '
+                             u'"keyword": "GPChain"}]}')
+            applies = dict((release, overlay(path).applies_to(
+                release_info(release)))
+                for release in ('10.8', 'Pro 2.5', 'Pro 3.0', 'Pro 3.1'))
+            self.assertEqual(applies, {'10.8': False, 'Pro 2.5': False,
+                                       'Pro 3.0': True, 'Pro 3.1': True})
+        finally:
+            shutil.rmtree(directory)
+
+
+class MainTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.toolbox = os.path.join(self.directory, 'Tools.pyt')
+        with open(self.toolbox, 'w') as toolbox:
+            toolbox.write(SOURCE)
+        self.stdout = sys.stdout
+        self.stderr = sys.stderr
+        sys.stdout = sys.stderr = self.output = tempfile.TemporaryFile('w+')
+
+    def tearDown(self):
+        sys.stdout = self.stdout
+        sys.stderr = self.stderr
+        self.output.close()
+        shutil.rmtree(self.directory)
+
+    def read_output(self):
+        self.output.seek(0)
+        return self.output.read()
+
+    def test_scan(self):
+        status = validate_datatypes.main(
+            ['-j', '1', '-r', '10.1 SP1', self.toolbox])
+        results = [json.loads(line)
+                   for line in self.read_output().splitlines()]
+        self.assertEqual(status, 0)
+        self.assertEqual(len(results), 8)
+        self.assertEqual(results[0]['releases'],
+                         {'10.1 SP1': {'status': 'convert',
+                                       'expected': 'DEFeatureClass'}})
+        self.assertEqual(validate_datatypes.main(
+            ['-j', '1', '-r', '10.1 SP1', '--strict', self.toolbox]), 1)
+
+    def test_bad_jobs(self):
+        for jobs in ('0', '-2'):
+            self.assertRaises(SystemExit, validate_datatypes.main,
+                              ['-j', jobs, self.toolbox])
+        self.assertTrue('--jobs must be at least 1' in self.read_output())
+
+    def scan_overlay(self, name, text, encoding, releases):
+        """ Statuses of a 'GPChain' parameter with an overlay file."""
+        overlay = os.path.join(self.directory, name)
+        with io.open(overlay, 'w', encoding=encoding) as handle:
+            handle.write(text)
+        with open(self.toolbox, 'w') as toolbox:
+            toolbox.write("p = arcpy.Parameter('p', 'P', 'Input', 'GPChain')")
+        argv = ['-j', '1', '-o', overlay, self.toolbox]
+        for release in releases:
+            argv[:0] = ['-r', release]
+        validate_datatypes.main(argv)
+        (result,) = [json.loads(line)
+                     for line in self.read_output().splitlines()]
+        return dict((release, status['status'])
+                    for (release, status) in result['releases'].items())
+
+    def test_pro_overlay(self):
+        statuses = self.scan_overlay(
+            'pro.json', u'{"version": "3.0", "product": "ArcGISPro", '
+            u'"types": [{"label": "Chain 0", "keyword": "GPChain"}]}',
+            'utf-8', ['Pro 2.5', 'Pro 3.0', 'Pro 3.1'])
+        self.assertEqual(statuses, {'Pro 2.5': 'unknown', 'Pro 3.0': 'ok',
+                                    'Pro 3.1': 'ok'})
+
+    def test_csv_overlay_byte_order_mark(self):
+        # as exported by Excel
+        statuses = self.scan_overlay(
+            'overlay.csv', u'label,keyword\r\nChain 0,GPChain\r\n',
+            'utf-8-sig', ['10.8'])
+        self.assertEqual(statuses, {'10.8': 'ok'})
+
+    def test_bad_release(self):
+        self.assertRaises(SystemExit, validate_datatypes.main,
+                          ['-r', 'latest', self.toolbox])
+        self.assertTrue("unknown release 'latest'" in self.read_output())
+
+    def test_missing_overlay(self):
+        missing = os.path.join(self.directory, 'missing.json')
+        self.assertRaises(SystemExit, validate_datatypes.main,
+                          ['-o', missing, self.toolbox])
+        self.assertTrue('bad overlay' in self.read_output())
+
+    def test_malformed_overlay(self):
+        overlay = os.path.join(self.directory, 'overlay.json')
+        with open(overlay, 'w') as handle:
+            handle.write('[{"name": "Chain 0"}]')
+        self.assertRaises(SystemExit, validate_datatypes.main,
+                          ['-o', overlay, self.toolbox])
+        self.assertTrue('bad overlay' in self.read_output())
+
+if __name__ == '__main__':
+    unittest.main()
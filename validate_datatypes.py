@@ -0,0 +1,302 @@
+# validate_datatypes.py: check Python toolbox datatypes without ArcGIS
+# -*- coding: utf-8 -*-
+""" Statically check the datatypes of the parameters in Python toolboxes
+against the DataType registry, for every target release, without importing
+arcpy:
+
+    python validate_datatypes.py [-j JOBS] [-r RELEASE ...] [-o OVERLAY ...]
+                                 PATH [PATH ...]
+
+PATHs are .pyt/.py files or directories to search for them, and OVERLAYs
+are JSON/CSV type overlay files layered over the registry for the releases
+they apply to (see datatype.TypeOverlay). RELEASEs are named in RELEASES,
+or given as 'VERSION', 'VERSION SPn' or 'Pro VERSION'. Files are
+parsed with ast, in parallel across a process pool, and every datatype
+passed to arcpy.Parameter() or assigned to a parameter's .datatype is
+reported as a line of JSON on stdout, as soon as its file is scanned:
+
+    {"file": ..., "line": ..., "datatype": ..., "releases": {...}}
+
+where each release maps to a status:
+
+    ok        the datatype is what the release expects
+    convert   a known datatype, but the release expects `expected`
+    variant   differs from a known datatype in case or whitespace
+    unknown   not a known datatype; `suggestions` lists close matches
+    dynamic   not a string literal, so it can't be checked
+
+Datatypes wrapped in a normalize() call are converted at run time, so are
+only checked for being known. Files that can't be read or parsed produce
+a line with an "error" instead. The exit status is 1 if any datatype is a
+variant or unknown, or any file failed, and 0 otherwise; with --strict,
+conversions count as failures too.
+"""
+import argparse
+import ast
+import json
+import os
+import re
+import sys
+from collections import OrderedDict
+from multiprocessing import Pool
+
+from datatype import DataType, load_overlay, string_types
+
+# Release name -> GetInstallInfo-style dictionary the release is checked as.
+RELEASES = OrderedDict([
+    ('10.1', {'Version': '10.1', 'SPNumber': 'N/A'}),
+    ('10.1 SP1', {'Version': '10.1', 'SPNumber': '1'}),
+    ('10.2', {'Version': '10.2', 'SPNumber': 'N/A'}),
+    ('10.3', {'Version': '10.3', 'SPNumber': 'N/A'}),
+    ('10.4', {'Version': '10.4', 'SPNumber': 'N/A'}),
+    ('10.5', {'Version': '10.5', 'SPNumber': 'N/A'}),
+    ('10.6', {'Version': '10.6', 'SPNumber': 'N/A'}),
+    ('10.7', {'Version': '10.7', 'SPNumber': 'N/A'}),
+    ('10.8', {'Version': '10.8', 'SPNumber': 'N/A'}),
+    ('Pro 2.0', {'Version': '2.0', 'SPNumber': 'N/A',
+                 'ProductName': 'ArcGISPro'}),
+    ('Pro 2.5', {'Version': '2.5', 'SPNumber': 'N/A',
+                 'ProductName': 'ArcGISPro'}),
+    ('Pro 3.0', {'Version': '3.0', 'SPNumber': 'N/A',
+                 'ProductName': 'ArcGISPro'}),
+])
+# other releases: 'VERSION', 'VERSION SPn' or 'Pro VERSION'
+RELEASE_PATTERN = re.compile(r'^(Pro )?(\d+(?:\.\d+)*)(?: SP(\d+))?$')
+
+EXTENSIONS = ('.pyt', '.py')
+# statuses that fail the run, and those that also fail it with --strict
+FAILURES = frozenset(['variant', 'unknown'])
+STRICT_FAILURES = FAILURES | frozenset(['convert'])
+
+# arcpy.Parameter(name, displayName, direction, datatype, ...)
+DATATYPE_POSITION = 3
+
+# DataType per release, built once per worker process (see _datatypes)
+_release_datatypes = None
+
+
+def release_info(release):
+    """ GetInstallInfo-style dictionary for a release name (see the module
+    documentation); raises ValueError for names it can't parse."""
+    if release in RELEASES:
+        return RELEASES[release]
+    match = RELEASE_PATTERN.match(release)
+    if match is None:
+        raise ValueError('unknown release %r' % (release,))
+    (pro, version, sp) = match.groups()
+    info = {'Version': version, 'SPNumber': sp or 'N/A'}
+    if pro:
+        info['ProductName'] = 'ArcGISPro'
+    return info
+
+
+def _release_argument(release):
+    """ argparse type of release names."""
+    try:
+        release_info(release)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return release
+
+
+def _datatypes(releases, overlays=()):
+    """ DataType for each named release, with overlays layered over it,
+    reusing the ones already built."""
+    global _release_datatypes
+    if _release_datatypes is None:
+        _release_datatypes = {}
+    datatypes = []
+    for release in releases:
+        key = (release, tuple(overlays))
+        if key not in _release_datatypes:
+            _release_datatypes[key] = DataType(
+                release_info(release), overlays)
+        datatypes.append((release, _release_datatypes[key]))
+    return datatypes
+
+
+def _string_value(node):
+    """ The value of a string literal node, or None."""
+    if sys.version_info < (3, 8):
+        # Python 2 and 3 before 3.8 parse string literals to ast.Str, even
+        # where ast.Constant exists
+        return node.s if isinstance(node, ast.Str) else None
+    if isinstance(node, ast.Constant) and \
+            isinstance(node.value, string_types):
+        return node.value
+    return None
+
+
+def _call_name(node):
+    """ The name a call is made through: 'Parameter' for both
+    arcpy.Parameter(...) and Parameter(...)."""
+    func = node.func
+    if isinstance(func, ast.Attribute):
+        return func.attr
+    if isinstance(func, ast.Name):
+        return func.id
+    return None
+
+
+def find_datatypes(tree):
+    """ Yield (node, normalized) for every datatype expression in a parsed
+    module: the datatype argument of Parameter() calls, and values assigned
+    to .datatype. normalized is True for expressions wrapped in a
+    normalize() call, whose node is then the normalize() argument."""
+    for node in ast.walk(tree):
+        values = []
+        if isinstance(node, ast.Call) and _call_name(node) == 'Parameter':
+            values.extend(k.value for k in node.keywords
+                          if k.arg == 'datatype')
+            if len(node.args) > DATATYPE_POSITION:
+                values.append(node.args[DATATYPE_POSITION])
+        elif isinstance(node, ast.Assign):
+            if any(isinstance(t, ast.Attribute) and t.attr == 'datatype'
+                   for t in node.targets):
+                values.append(node.value)
+        for value in values:
+            # composite parameters take a list of datatypes
+            if isinstance(value, (ast.List, ast.Tuple)):
+                elements = value.elts
+            else:
+                elements = [value]
+            for element in elements:
+                if isinstance(element, ast.Call) and \
+                        _call_name(element) == 'normalize' and element.args:
+                    yield (element.args[0], True)
+                else:
+                    yield (element, False)
+
+
+def check_datatype(raw_type, datatype, normalized=False):
+    """ Status of a datatype string under one release's DataType, as a
+    dictionary (see the module documentation)."""
+    expected = datatype.translation_table().get(raw_type)
+    if expected is not None:
+        if normalized or expected == raw_type:
+            return {'status': 'ok'}
+        return {'status': 'convert', 'expected': expected}
+    resolved = datatype.resolve(raw_type)
+    if resolved is not None:
+        if normalized:
+            return {'status': 'ok'}
+        return {'status': 'variant',
+                'expected': datatype.translation_table()[resolved]}
+    return {'status': 'unknown', 'suggestions': datatype.suggest(raw_type)}
+
+
+def scan_file(args):
+    """ Check every datatype in a file for the given releases, returning a
+    list of result dictionaries. Takes (path, releases, overlays) as a
+    single argument, to be mapped over by a process pool."""
+    (path, releases, overlays) = args
+    try:
+        with open(path, 'rb') as source:
+            tree = ast.parse(source.read(), path)
+    except (IOError, OSError, SyntaxError, ValueError) as e:
+        return [{'file': path, 'error': '%s: %s' % (type(e).__name__, e)}]
+    datatypes = _datatypes(releases, overlays)
+    results = []
+    for (node, normalized) in find_datatypes(tree):
+        raw_type = _string_value(node)
+        result = OrderedDict([
+            ('file', path),
+            ('line', node.lineno),
+            ('col', node.col_offset),
+            ('datatype', raw_type),
+        ])
+        if normalized:
+            result['normalized'] = True
+        statuses = OrderedDict()
+        for (release, datatype) in datatypes:
+            if raw_type is None:
+                statuses[release] = {'status': 'dynamic'}
+            else:
+                statuses[release] = check_datatype(
+                    raw_type, datatype, normalized)
+        result['releases'] = statuses
+        results.append(result)
+    results.sort(key=lambda r: (r['line'], r['col']))
+    return results
+
+
+def find_files(paths):
+    """ Yield the toolbox files named by paths, searching directories."""
+    for path in paths:
+        if os.path.isdir(path):
+            for (root, dirs, files) in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.endswith(EXTENSIONS):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def scan_files(paths, releases=None, jobs=None, chunksize=8, overlays=()):
+    """ Yield the results of scanning each file, in completion order. Files
+    are scanned across a pool of `jobs` processes (default: one per CPU),
+    or in this process if jobs is 1. overlays are paths of type overlay
+    files."""
+    if releases is None:
+        releases = list(RELEASES)
+    overlays = [os.path.abspath(overlay) for overlay in overlays]
+    work = ((path, releases, overlays) for path in find_files(paths))
+    if jobs == 1:
+        for results in map(scan_file, work):
+            yield results
+        return
+    pool = Pool(jobs)
+    try:
+        for results in pool.imap_unordered(scan_file, work, chunksize):
+            yield results
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Check Python toolbox datatypes against the DataType '
+                    'registry for each ArcGIS release.')
+    parser.add_argument('paths', nargs='+', metavar='PATH',
+                        help='.pyt/.py files, or directories to search')
+    parser.add_argument('-r', '--release', action='append',
+                        type=_release_argument, dest='releases',
+                        help='release to check, one of %s or a version '
+                             'such as "10.2.1" or "Pro 3.1" (repeatable; '
+                             'default: all named)' % ', '.join(RELEASES))
+    parser.add_argument('-o', '--overlay', action='append', default=[],
+                        dest='overlays',
+                        help='JSON/CSV type overlay file (repeatable)')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='worker processes (default: one per CPU)')
+    parser.add_argument('--strict', action='store_true',
+                        help='also fail on datatypes needing conversion')
+    args = parser.parse_args(argv)
+    if args.jobs is not None and args.jobs < 1:
+        parser.error('--jobs must be at least 1, not %d' % args.jobs)
+    # load the overlays here, so a bad one is reported once rather than
+    # raised in every worker
+    for overlay in args.overlays:
+        try:
+            load_overlay(overlay)
+        except (IOError, OSError, KeyError, TypeError, ValueError) as e:
+            parser.error('bad overlay %s: %s: %s' % (
+                overlay, type(e).__name__, e))
+
+    failures = STRICT_FAILURES if args.strict else FAILURES
+    failed = False
+    for results in scan_files(args.paths, args.releases, args.jobs,
+                              overlays=args.overlays):
+        for result in results:
+            sys.stdout.write(json.dumps(result) + '\n')
+            if 'error' in result or any(
+                    s['status'] in failures
+                    for s in result['releases'].values()):
+                failed = True
+        sys.stdout.flush()
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())